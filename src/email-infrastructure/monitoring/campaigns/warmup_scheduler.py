@@ -9,19 +9,126 @@ import os
 import json
 import logging
 import asyncio
-from datetime import datetime, timedelta
+from datetime import date, datetime
 from dataclasses import dataclass, asdict
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 import sqlite3
 import smtplib
-from email.mime.text import MimeText
-from email.mime.multipart import MimeMultipart
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
 import random
-import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Directories resolved once at import
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOGS_DIR = os.path.join(MODULE_DIR, 'logs')
+REPORTS_DIR = os.path.join(MODULE_DIR, 'reports')
 
 # Add parent directory to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(MODULE_DIR, '..'))
+
+# Emails logged per commit while executing a day's schedule
+EMAIL_LOG_COMMIT_BATCH = 50
+
+# Warmup emails allowed in flight at once
+MAX_CONCURRENT_SENDS = 4
+
+# Statements reused across runs, kept as constants so each connection's
+# statement cache hands back the prepared form
+_SQL_ACTIVE_SESSION = "SELECT id FROM warmup_sessions WHERE ip_address = ? AND status = 'active'"
+
+_SQL_INSERT_SESSION = '''
+    INSERT INTO warmup_sessions (ip_address, start_date, current_phase)
+    VALUES (?, ?, ?)
+'''
+
+_SQL_INSERT_DAILY_STATS = '''
+    INSERT INTO daily_stats (session_id, day, date, target_volume, phase)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_EMAIL_LOG = '''
+    INSERT INTO email_log (session_id, day, recipient_type, recipient_address, subject,
+                           sent_at, delivery_status, bounce_reason, response_time)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_UPDATE_DAILY_STATS = '''
+    UPDATE daily_stats 
+    SET actual_sent = ?, delivered = ?, bounced = ?, success_rate = ?
+    WHERE session_id = ? AND day = ?
+'''
+
+_SQL_UPDATE_SESSION = '''
+    UPDATE warmup_sessions 
+    SET current_day = ?, total_sent = total_sent + ?, 
+        total_delivered = total_delivered + ?, total_bounced = total_bounced + ?,
+        current_phase = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+# Runs after _SQL_UPDATE_SESSION so it reads the already-updated totals
+_SQL_UPDATE_SESSION_RATE = '''
+    UPDATE warmup_sessions 
+    SET success_rate = total_delivered * 100.0 / total_sent
+    WHERE id = ? AND total_sent > 0
+'''
+
+_SQL_SESSION_STATUS = '''
+    SELECT id AS session_id, ip_address, start_date, current_day, current_phase,
+           total_sent, total_delivered, total_bounced, success_rate, reputation_score, status
+    FROM warmup_sessions WHERE id = ?
+'''
+
+_SQL_DAILY_PROGRESS = '''
+    SELECT day, target_volume, actual_sent, delivered, bounced, success_rate, phase
+    FROM daily_stats WHERE session_id = ? ORDER BY day
+    LIMIT ? OFFSET ?
+'''
+
+# Peak hours that get a double share in the extended_hours pattern
+EXTENDED_PEAK_HOURS = frozenset({10, 11, 14, 15, 16})
+
+# Hourly weights (tenths) for the full_day pattern, 6 AM - 10 PM, following typical email patterns
+FULL_DAY_WEIGHTS = {
+    6: 5, 7: 8, 8: 12, 9: 15, 10: 18, 11: 18,
+    12: 12, 13: 10, 14: 15, 15: 18, 16: 18, 17: 15,
+    18: 10, 19: 8, 20: 6, 21: 4, 22: 3
+}
+FULL_DAY_TOTAL_WEIGHT = sum(FULL_DAY_WEIGHTS.values())
+
+# Recipient domain per mailbox provider
+RECIPIENT_DOMAINS = {
+    'gmail': 'gmail.com',
+    'outlook': 'outlook.com',
+    'yahoo': 'yahoo.com',
+    'apple': 'icloud.com',
+    'protonmail': 'protonmail.com',
+    'zoho': 'zoho.com',
+    'other': 'example.org'
+}
+
+# Subjects and bodies rotated through warmup emails
+WARMUP_SUBJECTS = (
+    "Welcome to our newsletter",
+    "Your account information",
+    "Monthly update from our team",
+    "Important notification",
+    "Thank you for your interest",
+    "Upcoming events and updates",
+    "Weekly digest",
+    "Account verification required",
+    "New features available",
+    "Service maintenance notice"
+)
+
+WARMUP_TEMPLATES = (
+    "Hello,\n\nThank you for subscribing to our service. We're excited to have you on board!\n\nBest regards,\nThe Team",
+    "Hi there,\n\nThis is a friendly reminder about your account. Please let us know if you have any questions.\n\nThanks,\nSupport Team",
+    "Dear Subscriber,\n\nWe wanted to share some exciting updates with you. Stay tuned for more!\n\nWarm regards,\nMarketing Team",
+    "Hello,\n\nWe hope you're enjoying our service. Your feedback is important to us.\n\nSincerely,\nCustomer Success"
+)
 
 class WarmupPhase(Enum):
     INITIALIZATION = "initialization"
@@ -55,18 +162,22 @@ class IPWarmupConfig:
     success_rate_threshold: float
     blacklist_check_frequency: int
     reputation_check_frequency: int
+    simulate_sending: bool = True  # False sends through smtp_host for real
 
 class WarmupScheduler:
+    _dirs_ready = False  # logs/ and reports/ created once per process
+    
     def __init__(self, config_path: str = None):
-        self.config_path = config_path or os.path.join(os.path.dirname(__file__), 'config/warmup_config.json')
-        self.db_path = os.path.join(os.path.dirname(__file__), 'logs/warmup_scheduler.db')
+        self.config_path = config_path or os.path.join(MODULE_DIR, 'config/warmup_config.json')
+        self.db_path = os.path.join(LOGS_DIR, 'warmup_scheduler.db')
+        self._ensure_dirs()
         
         # Setup logging
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(levelname)s - %(message)s',
             handlers=[
-                logging.FileHandler(os.path.join(os.path.dirname(__file__), 'logs/warmup_scheduler.log')),
+                logging.FileHandler(os.path.join(LOGS_DIR, 'warmup_scheduler.log')),
                 logging.StreamHandler()
             ]
         )
@@ -80,16 +191,45 @@ class WarmupScheduler:
         
         # Generate warmup schedule
         self.schedule = self._generate_warmup_schedule()
+        self._schedule_serialized = None  # JSON-ready copy, built on first report
+        
+        # Blocking SQLite work during a day's run goes to one worker thread
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='warmup-db')
+        
+        # Dedicated RNG for recipients, content and pacing; seed it for repeatable runs
+        self._rng = random.Random()
+        
+        # SMTP connection shared by all sends of one execute_daily_schedule run
+        self._smtp = None
+        self._smtp_lock = asyncio.Lock()  # smtplib connections are not safe to share between sends
         
         self.logger.info(f"Warmup Scheduler initialized for IP: {self.config.ip_address}")
 
+    @classmethod
+    def _ensure_dirs(cls):
+        """Create the logs and reports directories on first use"""
+        if not cls._dirs_ready:
+            os.makedirs(LOGS_DIR, exist_ok=True)
+            os.makedirs(REPORTS_DIR, exist_ok=True)
+            cls._dirs_ready = True
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a database connection with the per-connection performance PRAGMAs"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')
+        return conn
+
     def _init_database(self):
         """Initialize SQLite database for tracking warmup progress"""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
+        # WAL is persistent in the database file, so it only needs setting once
+        cursor.execute('PRAGMA journal_mode=WAL')
+        
         # Create tables
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS warmup_sessions (
@@ -143,6 +283,11 @@ class WarmupScheduler:
             )
         ''')
         
+        # Create indexes
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_daily_stats_sid_day ON daily_stats(session_id, day)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_email_log_sid_day ON email_log(session_id, day)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_ip_status ON warmup_sessions(ip_address, status)')
+        
         conn.commit()
         conn.close()
 
@@ -162,12 +307,13 @@ class WarmupScheduler:
                 "warmup_duration_days": 45,
                 "success_rate_threshold": 95.0,
                 "blacklist_check_frequency": 6,
-                "reputation_check_frequency": 12
+                "reputation_check_frequency": 12,
+                "simulate_sending": True
             }
             
             os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
             with open(self.config_path, 'w') as f:
-                json.dump(default_config, f, indent=2, default=str)
+                json.dump(default_config, f, indent=2)
             
             self.logger.info(f"Created default config at: {self.config_path}")
         
@@ -186,66 +332,82 @@ class WarmupScheduler:
             warmup_duration_days=config_data['warmup_duration_days'],
             success_rate_threshold=config_data['success_rate_threshold'],
             blacklist_check_frequency=config_data['blacklist_check_frequency'],
-            reputation_check_frequency=config_data['reputation_check_frequency']
+            reputation_check_frequency=config_data['reputation_check_frequency'],
+            simulate_sending=config_data.get('simulate_sending', True)
         )
 
     def _generate_warmup_schedule(self) -> List[WarmupSchedule]:
         """Generate complete warmup schedule with progressive volume scaling"""
         schedule = []
         
+        # Both distribution helpers are pure, so days with the same volume share results.
+        # The dicts are read-only once stored on a WarmupSchedule.
+        distribution_cache = {}
+        
+        def distributions(volume: int, phase: str, pattern: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+            key = (volume, phase, pattern)
+            if key not in distribution_cache:
+                distribution_cache[key] = (self._calculate_mailbox_distribution(volume, phase),
+                                           self._calculate_time_distribution(volume, pattern))
+            return distribution_cache[key]
+        
         # Phase 1: Initialization (Days 1-7) - 10-50 emails/day
         for day in range(1, 8):
             target_volume = min(10 + (day - 1) * 5, 50)
+            mailbox_distribution, time_distribution = distributions(target_volume, 'initialization', 'business_hours')
             schedule.append(WarmupSchedule(
                 day=day,
                 target_volume=target_volume,
                 phase=WarmupPhase.INITIALIZATION,
                 success_rate_target=98.0,
                 reputation_score_target=7.0,
-                mailbox_distribution=self._calculate_mailbox_distribution(target_volume, 'initialization'),
-                time_distribution=self._calculate_time_distribution(target_volume, 'business_hours'),
+                mailbox_distribution=mailbox_distribution,
+                time_distribution=time_distribution,
                 content_variation_required=min(3, target_volume // 10 + 1)
             ))
         
         # Phase 2: Gradual Ramp (Days 8-21) - 50-200 emails/day
         for day in range(8, 22):
             target_volume = min(50 + (day - 8) * 12, 200)
+            mailbox_distribution, time_distribution = distributions(target_volume, 'gradual_ramp', 'extended_hours')
             schedule.append(WarmupSchedule(
                 day=day,
                 target_volume=target_volume,
                 phase=WarmupPhase.GRADUAL_RAMP,
                 success_rate_target=97.0,
                 reputation_score_target=7.5,
-                mailbox_distribution=self._calculate_mailbox_distribution(target_volume, 'gradual_ramp'),
-                time_distribution=self._calculate_time_distribution(target_volume, 'extended_hours'),
+                mailbox_distribution=mailbox_distribution,
+                time_distribution=time_distribution,
                 content_variation_required=min(5, target_volume // 20 + 1)
             ))
         
         # Phase 3: Sustained Volume (Days 22-35) - 200-400 emails/day
         for day in range(22, 36):
             target_volume = min(200 + (day - 22) * 15, 400)
+            mailbox_distribution, time_distribution = distributions(target_volume, 'sustained_volume', 'full_day')
             schedule.append(WarmupSchedule(
                 day=day,
                 target_volume=target_volume,
                 phase=WarmupPhase.SUSTAINED_VOLUME,
                 success_rate_target=96.0,
                 reputation_score_target=8.0,
-                mailbox_distribution=self._calculate_mailbox_distribution(target_volume, 'sustained_volume'),
-                time_distribution=self._calculate_time_distribution(target_volume, 'full_day'),
+                mailbox_distribution=mailbox_distribution,
+                time_distribution=time_distribution,
                 content_variation_required=min(8, target_volume // 30 + 1)
             ))
         
         # Phase 4: Reputation Building (Days 36-45) - 400-500+ emails/day
         for day in range(36, self.config.warmup_duration_days + 1):
             target_volume = min(400 + (day - 36) * 12, self.config.target_daily_volume)
+            mailbox_distribution, time_distribution = distributions(target_volume, 'reputation_building', 'full_day')
             schedule.append(WarmupSchedule(
                 day=day,
                 target_volume=target_volume,
                 phase=WarmupPhase.REPUTATION_BUILDING,
                 success_rate_target=95.0,
                 reputation_score_target=8.5,
-                mailbox_distribution=self._calculate_mailbox_distribution(target_volume, 'reputation_building'),
-                time_distribution=self._calculate_time_distribution(target_volume, 'full_day'),
+                mailbox_distribution=mailbox_distribution,
+                time_distribution=time_distribution,
                 content_variation_required=min(10, target_volume // 40 + 1)
             ))
         
@@ -297,13 +459,12 @@ class WarmupScheduler:
         elif pattern == 'extended_hours':
             # 8 AM - 8 PM
             hours = list(range(8, 21))
-            # Peak hours get more emails
-            peak_hours = [10, 11, 14, 15, 16]
             
-            base_per_hour = volume // (len(hours) + len(peak_hours))  # Extra for peak hours
+            # Peak hours get more emails
+            base_per_hour = volume // (len(hours) + len(EXTENDED_PEAK_HOURS))  # Extra for peak hours
             
             for hour in hours:
-                multiplier = 2 if hour in peak_hours else 1
+                multiplier = 2 if hour in EXTENDED_PEAK_HOURS else 1
                 distribution[str(hour)] = base_per_hour * multiplier
                 
             # Distribute remainder
@@ -314,20 +475,11 @@ class WarmupScheduler:
                 
         else:  # full_day
             # 6 AM - 10 PM with natural distribution
-            hours = list(range(6, 23))
-            
-            # Weight distribution based on typical email patterns
-            weights = {
-                6: 0.5, 7: 0.8, 8: 1.2, 9: 1.5, 10: 1.8, 11: 1.8,
-                12: 1.2, 13: 1.0, 14: 1.5, 15: 1.8, 16: 1.8, 17: 1.5,
-                18: 1.0, 19: 0.8, 20: 0.6, 21: 0.4, 22: 0.3
+            distribution = {
+                str(hour): volume * weight // FULL_DAY_TOTAL_WEIGHT
+                for hour, weight in FULL_DAY_WEIGHTS.items()
             }
             
-            total_weight = sum(weights.values())
-            
-            for hour in hours:
-                distribution[str(hour)] = int(volume * weights[hour] / total_weight)
-            
             # Distribute remainder
             remainder = volume - sum(distribution.values())
             priority_hours = ['10', '11', '15', '16']  # Peak hours
@@ -339,40 +491,32 @@ class WarmupScheduler:
 
     async def start_warmup(self) -> int:
         """Start a new warmup session"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Check for existing active session
-        cursor.execute(
-            "SELECT id FROM warmup_sessions WHERE ip_address = ? AND status = 'active'",
-            (self.config.ip_address,)
-        )
+        cursor.execute(_SQL_ACTIVE_SESSION, (self.config.ip_address,))
         
         if cursor.fetchone():
             self.logger.warning(f"Active warmup session already exists for IP: {self.config.ip_address}")
             return None
         
         # Create new session
-        cursor.execute('''
-            INSERT INTO warmup_sessions (ip_address, start_date, current_phase)
-            VALUES (?, ?, ?)
-        ''', (self.config.ip_address, self.config.start_date.date(), 'initialization'))
+        cursor.execute(_SQL_INSERT_SESSION, (self.config.ip_address, self.config.start_date.date(), 'initialization'))
         
         session_id = cursor.lastrowid
         
-        # Create daily stats entries
-        for day_schedule in self.schedule:
-            target_date = self.config.start_date + timedelta(days=day_schedule.day - 1)
-            cursor.execute('''
-                INSERT INTO daily_stats (session_id, day, date, target_volume, phase)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
+        # Create daily stats entries, dating each day by ordinal offset from the start
+        start_ordinal = self.config.start_date.toordinal()
+        cursor.executemany(_SQL_INSERT_DAILY_STATS, [
+            (
                 session_id,
                 day_schedule.day,
-                target_date.date(),
+                date.fromordinal(start_ordinal + day_schedule.day - 1),
                 day_schedule.target_volume,
                 day_schedule.phase.value
-            ))
+            ) for day_schedule in self.schedule
+        ])
         
         conn.commit()
         conn.close()
@@ -389,246 +533,270 @@ class WarmupScheduler:
         day_schedule = self.schedule[day - 1]
         self.logger.info(f"Executing warmup schedule for day {day} - Target: {day_schedule.target_volume} emails")
         
-        # Get current stats
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # The connection is opened and only ever used on the DB worker thread
+        conn = await self._run_db(self._connect)
         
-        sent_count = 0
-        delivered_count = 0
-        bounced_count = 0
+        pending_log = []
         
-        # Execute time-distributed sending
+        # Provider weights for recipient sampling, fixed for the whole day
+        providers = list(day_schedule.mailbox_distribution.keys())
+        weights = list(day_schedule.mailbox_distribution.values())
+        
+        # Plan the day up front; staggers keep running across hours so the day is
+        # still sent hour after hour at the original pace, never hours in parallel
+        planned = []
+        stagger = 0.0
         for hour_str, email_count in day_schedule.time_distribution.items():
             if email_count == 0:
                 continue
-                
-            hour = int(hour_str)
-            current_time = datetime.now().replace(hour=hour, minute=0, second=0, microsecond=0)
             
+            hour = int(hour_str)
             self.logger.info(f"Scheduled {email_count} emails for {hour}:00")
             
-            # Send emails for this hour
             for i in range(email_count):
-                try:
-                    # Simulate email sending with realistic delays
-                    send_delay = random.uniform(30, 300)  # 30 seconds to 5 minutes between emails
-                    
-                    recipient_type, recipient_address = self._select_recipient(day_schedule.mailbox_distribution)
-                    subject, content = self._generate_email_content(day_schedule.content_variation_required)
-                    
-                    # Log the email attempt
-                    send_time = datetime.now()
-                    cursor.execute('''
-                        INSERT INTO email_log (session_id, day, recipient_type, recipient_address, subject, sent_at)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (session_id, day, recipient_type, recipient_address, subject, send_time))
-                    
-                    # Simulate sending (replace with actual SMTP in production)
+                recipient_type, recipient_address = self._select_recipient(providers, weights)
+                subject, content = self._generate_email_content(day_schedule.content_variation_required)
+                planned.append((stagger, hour, i, recipient_type, recipient_address, subject, content))
+                stagger += self._rng.uniform(30, 300)  # 30 seconds to 5 minutes between emails
+        
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        
+        async def send_one(stagger, hour, i, recipient_type, recipient_address, subject, content):
+            try:
+                await asyncio.sleep(stagger)
+                
+                async with semaphore:
+                    # Send (simulated unless the config turns simulate_sending off)
                     success, response_time = await self._send_email(recipient_address, subject, content)
-                    
-                    if success:
-                        delivered_count += 1
-                        cursor.execute('''
-                            UPDATE email_log SET delivery_status = 'delivered', response_time = ?
-                            WHERE id = ?
-                        ''', (response_time, cursor.lastrowid))
-                    else:
-                        bounced_count += 1
-                        cursor.execute('''
-                            UPDATE email_log SET delivery_status = 'bounced', bounce_reason = 'SMTP Error'
-                            WHERE id = ?
-                        ''', (cursor.lastrowid,))
-                    
-                    sent_count += 1
-                    
-                    # Commit after each email for safety
-                    conn.commit()
-                    
-                    # Wait before next email
-                    await asyncio.sleep(send_delay)
-                    
+                
+            except Exception as e:
+                self.logger.error(f"Error sending email {i+1} for hour {hour}: {str(e)}")
+                return None
+            
+            # Stamp the attempt when the send actually finished, after any semaphore/SMTP waits
+            send_time = datetime.now()
+            
+            # Log the finished attempt as a single row
+            if success:
+                pending_log.append((session_id, day, recipient_type, recipient_address, subject,
+                                    send_time, 'delivered', None, response_time))
+            else:
+                pending_log.append((session_id, day, recipient_type, recipient_address, subject,
+                                    send_time, 'bounced', 'SMTP Error', None))
+            
+            # Write log rows in batches rather than paying a sync per email
+            if len(pending_log) >= EMAIL_LOG_COMMIT_BATCH:
+                batch = pending_log[:]
+                pending_log.clear()
+                try:
+                    await self._run_db(self._flush_email_log, conn, batch)
                 except Exception as e:
-                    self.logger.error(f"Error sending email {i+1} for hour {hour}: {str(e)}")
-                    bounced_count += 1
+                    # Keep the rows for the end-of-day flush; the send itself already happened
+                    self.logger.error(f"Failed to write {len(batch)} email log rows, will retry: {str(e)}")
+                    pending_log[:0] = batch
+            
+            return success
+        
+        try:
+            results = await asyncio.gather(*(send_one(*email) for email in planned))
+        finally:
+            self._close_smtp()
+        
+        # None marks an attempt that errored before a send result came back
+        sent_count = sum(1 for result in results if result is not None)
+        delivered_count = sum(1 for result in results if result)
+        bounced_count = len(results) - delivered_count
         
-        # Update daily stats
         success_rate = (delivered_count / sent_count * 100) if sent_count > 0 else 0
         
-        cursor.execute('''
-            UPDATE daily_stats 
-            SET actual_sent = ?, delivered = ?, bounced = ?, success_rate = ?
-            WHERE session_id = ? AND day = ?
-        ''', (sent_count, delivered_count, bounced_count, success_rate, session_id, day))
+        await self._run_db(self._record_day_results, conn, pending_log, session_id, day, day_schedule.phase,
+                           sent_count, delivered_count, bounced_count, success_rate)
+        
+        self.logger.info(f"Day {day} completed: {sent_count} sent, {delivered_count} delivered, {success_rate:.2f}% success rate")
+
+    async def _run_db(self, func, *args):
+        """Run a blocking database call on the dedicated DB thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_executor, func, *args)
+
+    def _flush_email_log(self, conn: sqlite3.Connection, rows: List[Tuple]):
+        """Insert buffered email_log rows in one transaction"""
+        if not rows:
+            return
+        
+        try:
+            conn.executemany(_SQL_INSERT_EMAIL_LOG, rows)
+            conn.commit()
+        except Exception:
+            # Drop any rows inserted before the failure so a retry does not duplicate them
+            conn.rollback()
+            raise
+
+    def _record_day_results(self, conn: sqlite3.Connection, rows: List[Tuple], session_id: int, day: int,
+                            phase: WarmupPhase, sent_count: int, delivered_count: int, bounced_count: int,
+                            success_rate: float):
+        """Write the remaining log rows and the day's totals, then close the connection"""
+        self._flush_email_log(conn, rows)
+        
+        # Update daily stats
+        conn.execute(_SQL_UPDATE_DAILY_STATS, (sent_count, delivered_count, bounced_count, success_rate, session_id, day))
         
         # Update session totals
-        cursor.execute('''
-            UPDATE warmup_sessions 
-            SET current_day = ?, total_sent = total_sent + ?, 
-                total_delivered = total_delivered + ?, total_bounced = total_bounced + ?,
-                success_rate = CASE 
-                    WHEN (total_sent + ?) > 0 
-                    THEN ((total_delivered + ?) * 100.0 / (total_sent + ?))
-                    ELSE 0 
-                END,
-                current_phase = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (
+        conn.execute(_SQL_UPDATE_SESSION, (
             day, sent_count, delivered_count, bounced_count, 
-            sent_count, delivered_count, sent_count,
-            day_schedule.phase.value, session_id
+            phase.value, session_id
         ))
+        conn.execute(_SQL_UPDATE_SESSION_RATE, (session_id,))
         
         conn.commit()
         conn.close()
-        
-        self.logger.info(f"Day {day} completed: {sent_count} sent, {delivered_count} delivered, {success_rate:.2f}% success rate")
 
-    def _select_recipient(self, distribution: Dict[str, int]) -> Tuple[str, str]:
+    def _select_recipient(self, providers: List[str], weights: List[int]) -> Tuple[str, str]:
         """Select a recipient based on mailbox provider distribution"""
-        # Create weighted list
-        weighted_providers = []
-        for provider, count in distribution.items():
-            weighted_providers.extend([provider] * count)
-        
-        if not weighted_providers:
+        if not any(weights):
             return 'other', 'test@example.com'
             
-        provider = random.choice(weighted_providers)
+        provider = self._rng.choices(providers, weights)[0]
         
         # Generate recipient address based on provider
-        domains = {
-            'gmail': 'gmail.com',
-            'outlook': 'outlook.com',
-            'yahoo': 'yahoo.com',
-            'apple': 'icloud.com',
-            'protonmail': 'protonmail.com',
-            'zoho': 'zoho.com',
-            'other': 'example.org'
-        }
-        
-        username = f"warmup{random.randint(1000, 9999)}"
-        domain = domains.get(provider, 'example.com')
+        username = f"warmup{self._rng.randrange(1000, 10000)}"
+        domain = RECIPIENT_DOMAINS.get(provider, 'example.com')
         
         return provider, f"{username}@{domain}"
 
     def _generate_email_content(self, variation_count: int) -> Tuple[str, str]:
         """Generate varied email content to avoid spam filters"""
-        subjects = [
-            "Welcome to our newsletter",
-            "Your account information",
-            "Monthly update from our team",
-            "Important notification",
-            "Thank you for your interest",
-            "Upcoming events and updates",
-            "Weekly digest",
-            "Account verification required",
-            "New features available",
-            "Service maintenance notice"
-        ]
-        
-        templates = [
-            "Hello,\n\nThank you for subscribing to our service. We're excited to have you on board!\n\nBest regards,\nThe Team",
-            "Hi there,\n\nThis is a friendly reminder about your account. Please let us know if you have any questions.\n\nThanks,\nSupport Team",
-            "Dear Subscriber,\n\nWe wanted to share some exciting updates with you. Stay tuned for more!\n\nWarm regards,\nMarketing Team",
-            "Hello,\n\nWe hope you're enjoying our service. Your feedback is important to us.\n\nSincerely,\nCustomer Success"
-        ]
-        
-        subject = random.choice(subjects)
-        content = random.choice(templates)
-        
         # Add slight variations to avoid duplicate content
-        variation_suffix = f" #{random.randint(1, variation_count)}"
-        subject += variation_suffix
+        subject = f"{self._rng.choice(WARMUP_SUBJECTS)} #{self._rng.randrange(1, variation_count + 1)}"
+        content = self._rng.choice(WARMUP_TEMPLATES)
         
         return subject, content
 
     async def _send_email(self, recipient: str, subject: str, content: str) -> Tuple[bool, float]:
         """Send an email and return success status and response time"""
-        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         
         try:
-            # In production, replace this with actual SMTP sending
-            # For warmup testing, we simulate various response scenarios
-            
-            # Simulate network delay
-            await asyncio.sleep(random.uniform(0.1, 2.0))
-            
-            # Simulate success/failure rates based on warmup stage
-            success_probability = 0.95  # Adjust based on warmup progress
-            success = random.random() < success_probability
+            if self.config.simulate_sending:
+                # For warmup testing, we simulate various response scenarios
+                
+                # Simulate network delay
+                await asyncio.sleep(self._rng.uniform(0.1, 2.0))
+                
+                # Simulate success/failure rates based on warmup stage
+                success_probability = 0.95  # Adjust based on warmup progress
+                success = self._rng.random() < success_probability
+            else:
+                await self._smtp_send(recipient, subject, content)
+                success = True
             
-            response_time = time.time() - start_time
+            response_time = loop.time() - start_time
             return success, response_time
             
         except Exception as e:
             self.logger.error(f"SMTP error sending to {recipient}: {str(e)}")
-            response_time = time.time() - start_time
+            response_time = loop.time() - start_time
             return False, response_time
 
-    def get_session_status(self, session_id: int) -> Dict:
-        """Get current status of warmup session"""
-        conn = sqlite3.connect(self.db_path)
+    async def _smtp_send(self, recipient: str, subject: str, content: str):
+        """Send one message over the shared SMTP connection, reconnecting once if it dropped"""
+        message = MIMEText(content)
+        message['Subject'] = subject
+        message['From'] = self.config.username
+        message['To'] = recipient
+        payload = message.as_string()
+        
+        loop = asyncio.get_running_loop()
+        async with self._smtp_lock:
+            for attempt in range(2):
+                if self._smtp is None:
+                    self._smtp = await loop.run_in_executor(None, self._open_smtp)
+                try:
+                    await loop.run_in_executor(None, self._smtp.sendmail, self.config.username, [recipient], payload)
+                    return
+                except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError):
+                    self._smtp = None
+                    if attempt:
+                        raise
+
+    def _open_smtp(self) -> smtplib.SMTP:
+        """Connect, upgrade to TLS when offered, and log in"""
+        smtp = smtplib.SMTP(self.config.smtp_host, self.config.smtp_port, timeout=30)
+        smtp.ehlo()
+        if smtp.has_extn('starttls'):
+            smtp.starttls()
+            smtp.ehlo()
+        smtp.login(self.config.username, self.config.password)
+        return smtp
+
+    def _close_smtp(self):
+        """Close the shared SMTP connection if one is open"""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._smtp = None
+
+    def get_session_status(self, session_id: int, progress_limit: int = -1, progress_offset: int = 0) -> Dict:
+        """Get current status of warmup session, optionally paging the daily progress"""
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Get session info
-        cursor.execute('''
-            SELECT * FROM warmup_sessions WHERE id = ?
-        ''', (session_id,))
+        cursor.execute(_SQL_SESSION_STATUS, (session_id,))
         
         session = cursor.fetchone()
         if not session:
+            conn.close()
             return {"error": "Session not found"}
         
-        # Get daily progress
-        cursor.execute('''
-            SELECT day, target_volume, actual_sent, delivered, bounced, success_rate, phase
-            FROM daily_stats WHERE session_id = ? ORDER BY day
-        ''', (session_id,))
+        # Get daily progress (a negative limit means every day)
+        cursor.execute(_SQL_DAILY_PROGRESS, (session_id, progress_limit, progress_offset))
         
-        daily_stats = cursor.fetchall()
+        status = dict(session)
+        status["daily_progress"] = [dict(row) for row in cursor.fetchall()]
         
         conn.close()
         
-        return {
-            "session_id": session_id,
-            "ip_address": session[1],
-            "start_date": session[2],
-            "current_day": session[3],
-            "current_phase": session[4],
-            "total_sent": session[5],
-            "total_delivered": session[6],
-            "total_bounced": session[7],
-            "success_rate": session[8],
-            "reputation_score": session[9],
-            "status": session[10],
-            "daily_progress": [
-                {
-                    "day": row[0],
-                    "target_volume": row[1],
-                    "actual_sent": row[2],
-                    "delivered": row[3],
-                    "bounced": row[4],
-                    "success_rate": row[5],
-                    "phase": row[6]
-                } for row in daily_stats
-            ]
-        }
+        return status
+
+    def _get_serialized_schedule(self) -> List[Dict]:
+        """Return the schedule as JSON-ready dicts, serializing it only once"""
+        if self._schedule_serialized is None:
+            serialized = []
+            for day_schedule in self.schedule:
+                entry = asdict(day_schedule)
+                entry['phase'] = day_schedule.phase.value
+                serialized.append(entry)
+            self._schedule_serialized = serialized
+        return self._schedule_serialized
 
     def generate_schedule_report(self) -> str:
         """Generate a detailed warmup schedule report"""
-        report_path = os.path.join(os.path.dirname(__file__), 'reports/warmup_schedule.json')
-        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        report_path = os.path.join(REPORTS_DIR, 'warmup_schedule.json')
         
-        schedule_data = {
+        header = {
             "ip_address": self.config.ip_address,
             "domain": self.config.domain,
             "warmup_duration": self.config.warmup_duration_days,
-            "target_daily_volume": self.config.target_daily_volume,
-            "schedule": [asdict(day_schedule) for day_schedule in self.schedule]
+            "target_daily_volume": self.config.target_daily_volume
         }
         
+        # Stream the report: header fields first, then one schedule day per line
         with open(report_path, 'w') as f:
-            json.dump(schedule_data, f, indent=2, default=str)
+            f.write('{\n')
+            for key, value in header.items():
+                f.write(f'  {json.dumps(key)}: {json.dumps(value)},\n')
+            f.write('  "schedule": [')
+            separator = '\n    '
+            for day_entry in self._get_serialized_schedule():
+                f.write(separator)
+                f.write(json.dumps(day_entry))
+                separator = ',\n    '
+            f.write('\n  ]\n}\n')
         
         self.logger.info(f"Schedule report generated: {report_path}")
         return report_path
@@ -658,7 +826,7 @@ async def main():
         
     elif args.status and args.session_id:
         status = scheduler.get_session_status(args.session_id)
-        print(json.dumps(status, indent=2, default=str))
+        print(json.dumps(status, indent=2))
         
     elif args.generate_schedule:
         report_path = scheduler.generate_schedule_report()
@@ -12,7 +12,7 @@ import asyncio
 import aiohttp
 import sqlite3
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from typing import Dict, List, Optional, Tuple, Any
 from enum import Enum
 import dns.resolver
@@ -20,6 +20,10 @@ import dns.reversename
 import socket
 import time
 import hashlib
+import threading
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 # Add parent directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -37,6 +41,106 @@ class CheckStatus(Enum):
     TIMEOUT = "timeout"
     ERROR = "error"
 
+# Columns tagged "name [BOOLEAN]" come back as Python bools (see PARSE_COLNAMES below)
+sqlite3.register_converter('BOOLEAN', lambda value: value == b'1')
+
+# Literals folded out of traced SQL so statements group by shape, not bound values.
+# The trace callback sees the expanded SQL, so this covers everything sqlite prints
+# for a bound value: blobs, strings and signed/exponent numbers (e.g. 5.8e-06).
+_SQL_LITERAL_RE = re.compile(r"\b[xX]'[0-9a-fA-F]*'|'(?:[^']|'')*'|-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b")
+
+# Statuses that count as a completed (non-failed) provider query
+SUCCESSFUL_CHECK_STATUSES = frozenset({CheckStatus.CLEAR, CheckStatus.BLACKLISTED, CheckStatus.SUSPICIOUS})
+
+# Hot-path statements, kept as constants so the shared connection's
+# statement cache reuses the prepared form on every call
+_SQL_INSERT_CHECK = '''
+    INSERT INTO blacklist_checks 
+    (check_time, ip_address, domain, provider, blacklist_type, 
+     is_blacklisted, status, response_time, details, raw_response)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_TARGET = '''
+    INSERT INTO monitoring_targets (ip_address, domain, check_frequency, alert_threshold)
+    VALUES (?, ?, ?, ?)
+'''
+
+_SQL_UPDATE_TARGET = '''
+    UPDATE monitoring_targets 
+    SET last_check = ?, blacklist_count = ?, reputation_score = ?, updated_at = ?
+    WHERE ip_address = ?
+'''
+
+_SQL_ALERT_COOLDOWN = '''
+    SELECT id FROM blacklist_alerts 
+    WHERE ip_address = ? AND alert_type = 'blacklist_detected' 
+    AND created_at > datetime('now', '-1 hour')
+    AND is_resolved = FALSE
+'''
+
+_SQL_INSERT_ALERT = '''
+    INSERT INTO blacklist_alerts 
+    (ip_address, domain, alert_type, severity, message, blacklist_count, affected_providers)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_STAGE_STATS = '''
+    INSERT INTO provider_stats_stage 
+    (provider_name, check_date, total_checks, successful_checks, 
+     failed_checks, avg_response_time, blacklisted_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_MERGE_STATS = '''
+    INSERT INTO provider_stats 
+    (provider_name, check_date, total_checks, successful_checks, 
+     failed_checks, avg_response_time, blacklisted_count)
+    SELECT provider_name, check_date, total_checks, successful_checks, 
+           failed_checks, avg_response_time, blacklisted_count
+    FROM provider_stats_stage WHERE true
+    ON CONFLICT(provider_name, check_date) DO UPDATE SET
+        total_checks = total_checks + excluded.total_checks,
+        successful_checks = successful_checks + excluded.successful_checks,
+        failed_checks = failed_checks + excluded.failed_checks,
+        avg_response_time = excluded.avg_response_time,
+        blacklisted_count = blacklisted_count + excluded.blacklisted_count
+'''
+
+_SQL_TARGET_SELECT = '''
+    SELECT domain, is_active AS "is_active [BOOLEAN]", last_check, blacklist_count, reputation_score,
+           check_frequency, alert_threshold
+    FROM monitoring_targets WHERE ip_address = ?
+'''
+
+# Last day's checks and open alerts for one IP in a single round-trip,
+# tagged by kind so get_target_status can split them
+_SQL_TARGET_ACTIVITY = '''
+    SELECT 'check' AS kind, provider, status, check_time AS ts, details,
+           is_blacklisted AS "is_blacklisted [BOOLEAN]"
+    FROM blacklist_checks 
+    WHERE ip_address = ?1 AND check_time >= datetime('now', '-1 day')
+    UNION ALL
+    SELECT 'alert', alert_type, severity, created_at, message, NULL
+    FROM blacklist_alerts 
+    WHERE ip_address = ?1 AND is_resolved = FALSE
+    ORDER BY kind, ts DESC
+'''
+
+_SQL_PROVIDER_PERF = '''
+    SELECT 
+        provider_name,
+        SUM(total_checks) as total_checks,
+        SUM(successful_checks) as successful_checks,
+        SUM(failed_checks) as failed_checks,
+        AVG(avg_response_time) as avg_response_time,
+        SUM(blacklisted_count) as blacklisted_count
+    FROM provider_stats 
+    WHERE check_date >= CAST(strftime('%s', 'now') AS INTEGER) / 86400 - ?
+    GROUP BY provider_name
+    ORDER BY total_checks DESC
+'''
+
 @dataclass
 class BlacklistProvider:
     name: str
@@ -72,6 +176,19 @@ class MonitoringTarget:
     blacklist_count: int = 0
     reputation_score: float = 10.0  # 0-10 scale
 
+@dataclass
+class TargetStatus:
+    ip_address: str
+    domain: str
+    is_active: bool
+    last_check: Optional[str]  # timestamps stay as the text SQLite stores
+    blacklist_count: int
+    reputation_score: float
+    check_frequency: int
+    alert_threshold: int
+    recent_checks: List[Dict] = field(default_factory=list)
+    active_alerts: List[Dict] = field(default_factory=list)
+
 class BlacklistMonitor:
     def __init__(self, config_path: str = None):
         self.config_path = config_path or os.path.join(os.path.dirname(__file__), 'config/blacklist_config.json')
@@ -88,9 +205,18 @@ class BlacklistMonitor:
         )
         self.logger = logging.getLogger(__name__)
         
+        # Single worker keeps SQLite writes serialized and off the event loop
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='blacklist-db')
+        self._db_lock = threading.RLock()
+        
         # Initialize database
         self._init_database()
         
+        # Optional statement profiling, enabled with MONITOR_SQL_TRACE=1
+        self._sql_trace = None
+        if os.getenv('MONITOR_SQL_TRACE'):
+            self._enable_sql_trace()
+        
         # Load configuration
         self.config = self._load_config()
         
@@ -111,9 +237,22 @@ class BlacklistMonitor:
         """Initialize SQLite database for blacklist tracking"""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         
-        conn = sqlite3.connect(self.db_path)
+        # One connection for the monitor's lifetime so prepared statements
+        # stay cached; access is serialized through self._db_lock
+        # PARSE_COLNAMES rather than PARSE_DECLTYPES: only explicitly tagged
+        # columns are converted, so TIMESTAMP text and the integer check_date
+        # are not run through the stdlib date/timestamp converters
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                     detect_types=sqlite3.PARSE_COLNAMES)
+        self._conn.row_factory = sqlite3.Row
+        conn = self._conn
         cursor = conn.cursor()
         
+        # Monitoring telemetry is recoverable, so trade the per-commit fsync for WAL appends
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA wal_autocheckpoint=1000')
+        
         # Create tables
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS blacklist_checks (
@@ -168,7 +307,7 @@ class BlacklistMonitor:
             CREATE TABLE IF NOT EXISTS provider_stats (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 provider_name TEXT NOT NULL,
-                check_date DATE NOT NULL,
+                check_date INTEGER NOT NULL,  -- days since the Unix epoch (UTC)
                 total_checks INTEGER DEFAULT 0,
                 successful_checks INTEGER DEFAULT 0,
                 failed_checks INTEGER DEFAULT 0,
@@ -178,14 +317,87 @@ class BlacklistMonitor:
             )
         ''')
         
+        # Convert check_date values written as ISO date strings by older versions
+        cursor.execute('''
+            UPDATE provider_stats
+            SET check_date = CAST(julianday(check_date) - 2440587.5 AS INTEGER)
+            WHERE typeof(check_date) = 'text'
+        ''')
+        
+        # Per-connection staging table for batched provider_stats merges
+        cursor.execute('''
+            CREATE TEMP TABLE IF NOT EXISTS provider_stats_stage (
+                provider_name TEXT NOT NULL,
+                check_date INTEGER NOT NULL,
+                total_checks INTEGER,
+                successful_checks INTEGER,
+                failed_checks INTEGER,
+                avg_response_time REAL,
+                blacklisted_count INTEGER
+            )
+        ''')
+        
         # Create indexes
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_checks_ip_time ON blacklist_checks(ip_address, check_time)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_checks_provider ON blacklist_checks(provider)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_targets_ip ON monitoring_targets(ip_address)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_ip ON blacklist_alerts(ip_address)')
+        cursor.execute('DROP INDEX IF EXISTS idx_alerts_ip')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_ip_open ON blacklist_alerts(ip_address, is_resolved, created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_stats_date_name ON provider_stats(check_date, provider_name)')
         
         conn.commit()
-        conn.close()
+
+    def close(self):
+        """Release the DB worker thread and the shared connection"""
+        self._db_executor.shutdown(wait=True)
+        with self._db_lock:
+            if self._sql_trace is not None:
+                self._log_sql_trace()
+            self._conn.close()
+
+    @contextmanager
+    def _db_section(self):
+        """Hold the DB lock around a group of statements on the shared connection
+        
+        With tracing on, leaving the section ends the last traced statement, so
+        time spent outside the database is never charged to it.
+        """
+        with self._db_lock:
+            try:
+                yield
+            finally:
+                if self._sql_trace is not None:
+                    self._finish_traced_statement()
+
+    def _enable_sql_trace(self):
+        """Record per-statement counts and timings on the shared connection"""
+        self._sql_trace = {}
+        self._sql_trace_last = None
+        self._conn.set_trace_callback(self._trace_sql)
+
+    def _trace_sql(self, statement: str):
+        """Trace callback: end the previous statement and start timing this one"""
+        self._finish_traced_statement()
+        key = ' '.join(_SQL_LITERAL_RE.sub('?', statement).split())
+        self._sql_trace_last = (key, time.perf_counter_ns())
+
+    def _finish_traced_statement(self):
+        """Charge the statement being timed with the time since it started"""
+        if self._sql_trace_last is None:
+            return
+        
+        key, started = self._sql_trace_last
+        entry = self._sql_trace.setdefault(key, [0, 0])
+        entry[0] += 1
+        entry[1] += time.perf_counter_ns() - started
+        self._sql_trace_last = None
+
+    def _log_sql_trace(self, top_n: int = 10):
+        """Log the statements with the highest cumulative time"""
+        ranked = sorted(self._sql_trace.items(), key=lambda item: item[1][1], reverse=True)
+        self.logger.info(f"SQL trace: {len(ranked)} distinct statements")
+        for key, (count, elapsed_ns) in ranked[:top_n]:
+            self.logger.info(f"  {elapsed_ns / 1e6:9.2f} ms  {count:6d}x  {key[:120]}")
 
     def _load_config(self) -> Dict:
         """Load blacklist monitoring configuration"""
@@ -345,17 +557,16 @@ class BlacklistMonitor:
 
     def _load_monitoring_targets(self) -> List[MonitoringTarget]:
         """Load monitoring targets from database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT ip_address, domain, check_frequency, alert_threshold, 
-                   is_active, last_check, blacklist_count, reputation_score
-            FROM monitoring_targets WHERE is_active = TRUE
-        ''')
+        with self._db_section():
+            cursor = self._conn.execute('''
+                SELECT ip_address, domain, check_frequency, alert_threshold, 
+                       is_active, last_check, blacklist_count, reputation_score
+                FROM monitoring_targets WHERE is_active = TRUE
+            ''')
+            rows = cursor.fetchall()
         
         targets = []
-        for row in cursor.fetchall():
+        for row in rows:
             targets.append(MonitoringTarget(
                 ip_address=row[0],
                 domain=row[1],
@@ -367,23 +578,14 @@ class BlacklistMonitor:
                 reputation_score=row[7]
             ))
         
-        conn.close()
         return targets
 
     async def add_monitoring_target(self, ip_address: str, domain: str = None, 
                                   check_frequency: int = 60, alert_threshold: int = 1) -> int:
         """Add a new monitoring target"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute('''
-                INSERT INTO monitoring_targets (ip_address, domain, check_frequency, alert_threshold)
-                VALUES (?, ?, ?, ?)
-            ''', (ip_address, domain, check_frequency, alert_threshold))
-            
-            target_id = cursor.lastrowid
-            conn.commit()
+            target_id = await self._run_db(self._add_monitoring_target_sync, ip_address, domain,
+                                           check_frequency, alert_threshold)
             
             # Add to active targets
             self.targets.append(MonitoringTarget(
@@ -399,10 +601,21 @@ class BlacklistMonitor:
         except sqlite3.IntegrityError:
             self.logger.warning(f"Target {ip_address} already exists")
             return None
-        finally:
-            conn.close()
 
-    async def check_ip_blacklists(self, ip_address: str) -> List[BlacklistCheck]:
+    def _add_monitoring_target_sync(self, ip_address: str, domain: Optional[str],
+                                    check_frequency: int, alert_threshold: int) -> int:
+        """Insert a monitoring target and commit (runs on the DB thread)"""
+        with self._db_section():
+            try:
+                cursor = self._conn.execute(_SQL_INSERT_TARGET, (ip_address, domain, check_frequency, alert_threshold))
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        
+        return cursor.lastrowid
+
+    async def check_ip_blacklists(self, ip_address: str, save: bool = True) -> List[BlacklistCheck]:
         """Check IP address against all IP blacklist providers"""
         checks = []
         
@@ -424,12 +637,13 @@ class BlacklistMonitor:
             elif isinstance(result, Exception):
                 self.logger.error(f"Blacklist check failed: {str(result)}")
         
-        # Save checks to database
-        await self._save_blacklist_checks(checks)
+        # Save checks to database (monitoring passes batch this with their other writes)
+        if save:
+            await self._save_blacklist_checks(checks)
         
         return checks
 
-    async def check_domain_blacklists(self, domain: str) -> List[BlacklistCheck]:
+    async def check_domain_blacklists(self, domain: str, save: bool = True) -> List[BlacklistCheck]:
         """Check domain against all domain blacklist providers"""
         checks = []
         
@@ -451,8 +665,9 @@ class BlacklistMonitor:
             elif isinstance(result, Exception):
                 self.logger.error(f"Domain blacklist check failed: {str(result)}")
         
-        # Save checks to database
-        await self._save_blacklist_checks(checks)
+        # Save checks to database (monitoring passes batch this with their other writes)
+        if save:
+            await self._save_blacklist_checks(checks)
         
         return checks
 
@@ -616,7 +831,7 @@ class BlacklistMonitor:
                         details = data.get('details', 'API check completed')
                         
                         status = CheckStatus.BLACKLISTED if is_blacklisted else CheckStatus.CLEAR
-                        return status, details, json.dumps(data)
+                        return status, details, json.dumps(data)[:500]
                     else:
                         return CheckStatus.ERROR, f"API error {response.status}", str(data)
                         
@@ -625,35 +840,23 @@ class BlacklistMonitor:
         except Exception as e:
             return CheckStatus.ERROR, str(e), ""
 
+    async def _run_db(self, func, *args):
+        """Run a blocking database call on the dedicated DB thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_executor, func, *args)
+
     async def _save_blacklist_checks(self, checks: List[BlacklistCheck]):
         """Save blacklist checks to database"""
         if not checks:
             return
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        for check in checks:
-            cursor.execute('''
-                INSERT INTO blacklist_checks 
-                (check_time, ip_address, domain, provider, blacklist_type, 
-                 is_blacklisted, status, response_time, details, raw_response)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                check.timestamp,
-                check.ip_address,
-                check.domain,
-                check.provider,
-                check.blacklist_type.value,
-                check.status == CheckStatus.BLACKLISTED,
-                check.status.value,
-                check.response_time,
-                check.details,
-                check.raw_response
-            ))
-        
-        conn.commit()
-        conn.close()
+        await self._run_db(self._save_blacklist_checks_sync, checks)
+
+    def _save_blacklist_checks_sync(self, checks: List[BlacklistCheck]):
+        """Insert blacklist checks in their own transaction (runs on the DB thread)"""
+        with self._db_section():
+            self._write_checks(self._conn.cursor(), checks)
+            self._conn.commit()
 
     async def monitor_targets_continuously(self):
         """Continuously monitor all active targets"""
@@ -670,10 +873,6 @@ class BlacklistMonitor:
                         datetime.now() - target.last_check >= timedelta(minutes=target.check_frequency)):
                         
                         await self._monitor_single_target(target)
-                        
-                        # Update last check time
-                        target.last_check = datetime.now()
-                        await self._update_target_info(target)
                 
                 # Wait before next monitoring cycle
                 await asyncio.sleep(60)  # Check every minute
@@ -687,12 +886,12 @@ class BlacklistMonitor:
         self.logger.debug(f"Monitoring target: {target.ip_address}")
         
         # Check IP blacklists
-        ip_checks = await self.check_ip_blacklists(target.ip_address)
+        ip_checks = await self.check_ip_blacklists(target.ip_address, save=False)
         
         # Check domain blacklists if domain is available
         domain_checks = []
         if target.domain:
-            domain_checks = await self.check_domain_blacklists(target.domain)
+            domain_checks = await self.check_domain_blacklists(target.domain, save=False)
         
         all_checks = ip_checks + domain_checks
         
@@ -709,80 +908,112 @@ class BlacklistMonitor:
         target.reputation_score = max(0.0, old_score - penalty)
         
         # Check if alert is needed
+        alert = None
         if blacklist_count >= target.alert_threshold:
-            await self._create_alert(target, blacklisted_checks)
+            alert = self._build_alert(target, blacklisted_checks)
+        
+        # Update last check time
+        target.last_check = datetime.now()
         
-        # Update provider statistics
-        await self._update_provider_stats(all_checks)
+        # Persist checks, alert, provider statistics and target state in one transaction
+        alert_id = await self._run_db(self._record_tick_sync, target, all_checks, alert)
+        
+        if alert_id is not None:
+            severity, message, _ = alert
+            self.logger.warning(f"ALERT: {message}")
+            
+            # Send notifications (implement based on config)
+            await self._send_alert_notifications(alert_id, target, message, severity)
         
         self.logger.debug(f"Target {target.ip_address}: {blacklist_count} blacklists, score: {target.reputation_score:.2f}")
 
-    async def _update_target_info(self, target: MonitoringTarget):
-        """Update target information in database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _record_tick_sync(self, target: MonitoringTarget, checks: List[BlacklistCheck],
+                          alert: Optional[Tuple[str, str, str]]) -> Optional[int]:
+        """Write one monitoring pass for a target and commit once (runs on the DB thread)"""
+        stats_rows = self._aggregate_provider_stats(checks)
         
-        cursor.execute('''
-            UPDATE monitoring_targets 
-            SET last_check = ?, blacklist_count = ?, reputation_score = ?, updated_at = ?
-            WHERE ip_address = ?
-        ''', (
+        with self._db_section():
+            cursor = self._conn.cursor()
+            try:
+                self._write_checks(cursor, checks)
+                
+                alert_id = None
+                if alert is not None:
+                    alert_id = self._write_alert(cursor, target, *alert)
+                
+                self._write_provider_stats(cursor, stats_rows)
+                self._write_target_info(cursor, target)
+                
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        
+        return alert_id
+
+    def _build_alert(self, target: MonitoringTarget,
+                     blacklisted_checks: List[BlacklistCheck]) -> Tuple[str, str, str]:
+        """Build severity, message and affected-providers JSON for a blacklisted target"""
+        # Order-preserving dedupe so repeated listings from one provider are stored once
+        affected_providers = list(dict.fromkeys(check.provider for check in blacklisted_checks))
+        
+        severity = "critical" if target.blacklist_count >= 3 else "high" if target.blacklist_count >= 2 else "medium"
+        
+        message = f"IP {target.ip_address} detected on {target.blacklist_count} blacklists: {', '.join(affected_providers)}"
+        
+        return severity, message, json.dumps(affected_providers, separators=(',', ':'))
+
+    def _write_checks(self, cursor: sqlite3.Cursor, checks: List[BlacklistCheck]):
+        """Insert blacklist check rows (caller holds the DB lock and commits)"""
+        if not checks:
+            return
+        
+        rows = [
+            (
+                check.timestamp,
+                check.ip_address,
+                check.domain,
+                check.provider,
+                check.blacklist_type.value,
+                check.status == CheckStatus.BLACKLISTED,
+                check.status.value,
+                check.response_time,
+                check.details,
+                check.raw_response
+            ) for check in checks
+        ]
+        
+        cursor.executemany(_SQL_INSERT_CHECK, rows)
+
+    def _write_target_info(self, cursor: sqlite3.Cursor, target: MonitoringTarget):
+        """Update target state (caller holds the DB lock and commits)"""
+        cursor.execute(_SQL_UPDATE_TARGET, (
             target.last_check,
             target.blacklist_count,
             target.reputation_score,
             datetime.now(),
             target.ip_address
         ))
-        
-        conn.commit()
-        conn.close()
 
-    async def _create_alert(self, target: MonitoringTarget, blacklisted_checks: List[BlacklistCheck]):
-        """Create alert for blacklisted target"""
-        affected_providers = [check.provider for check in blacklisted_checks]
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+    def _write_alert(self, cursor: sqlite3.Cursor, target: MonitoringTarget, severity: str,
+                     message: str, affected_providers_json: str) -> Optional[int]:
+        """Insert an alert unless one is still in cooldown (caller holds the DB lock and commits)"""
         # Check for recent similar alerts (cooldown)
-        cursor.execute('''
-            SELECT id FROM blacklist_alerts 
-            WHERE ip_address = ? AND alert_type = 'blacklist_detected' 
-            AND created_at > datetime('now', '-1 hour')
-            AND is_resolved = FALSE
-        ''', (target.ip_address,))
-        
+        cursor.execute(_SQL_ALERT_COOLDOWN, (target.ip_address,))
         if cursor.fetchone():
-            conn.close()
-            return  # Alert already exists within cooldown period
-        
-        # Create new alert
-        severity = "critical" if target.blacklist_count >= 3 else "high" if target.blacklist_count >= 2 else "medium"
-        
-        message = f"IP {target.ip_address} detected on {target.blacklist_count} blacklists: {', '.join(affected_providers)}"
+            return None
         
-        cursor.execute('''
-            INSERT INTO blacklist_alerts 
-            (ip_address, domain, alert_type, severity, message, blacklist_count, affected_providers)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        cursor.execute(_SQL_INSERT_ALERT, (
             target.ip_address,
             target.domain,
             'blacklist_detected',
             severity,
             message,
             target.blacklist_count,
-            json.dumps(affected_providers)
+            affected_providers_json
         ))
         
-        alert_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        self.logger.warning(f"ALERT: {message}")
-        
-        # Send notifications (implement based on config)
-        await self._send_alert_notifications(alert_id, target, message, severity)
+        return cursor.lastrowid
 
     async def _send_alert_notifications(self, alert_id: int, target: MonitoringTarget, 
                                       message: str, severity: str):
@@ -791,151 +1022,113 @@ class BlacklistMonitor:
         # For now, just log the alert
         self.logger.critical(f"BLACKLIST ALERT [{severity.upper()}]: {message}")
 
-    async def _update_provider_stats(self, checks: List[BlacklistCheck]):
-        """Update provider performance statistics"""
-        if not checks:
-            return
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+    def _aggregate_provider_stats(self, checks: List[BlacklistCheck]) -> List[Tuple]:
+        """Fold checks into one provider_stats row per provider (no DB access)"""
         # Group checks by provider
         provider_stats = {}
         for check in checks:
-            if check.provider not in provider_stats:
-                provider_stats[check.provider] = {
+            stats = provider_stats.get(check.provider)
+            if stats is None:
+                stats = provider_stats[check.provider] = {
                     'total': 0,
                     'successful': 0,
                     'failed': 0,
-                    'response_times': [],
+                    'sum_rt': 0.0,
                     'blacklisted': 0
                 }
             
-            stats = provider_stats[check.provider]
             stats['total'] += 1
             
-            if check.status in [CheckStatus.CLEAR, CheckStatus.BLACKLISTED, CheckStatus.SUSPICIOUS]:
+            if check.status in SUCCESSFUL_CHECK_STATUSES:
                 stats['successful'] += 1
-                stats['response_times'].append(check.response_time)
+                stats['sum_rt'] += check.response_time
+                if check.status is CheckStatus.BLACKLISTED:
+                    stats['blacklisted'] += 1
             else:
                 stats['failed'] += 1
-            
-            if check.status == CheckStatus.BLACKLISTED:
-                stats['blacklisted'] += 1
         
-        # Update database
-        today = datetime.now().date()
-        
-        for provider_name, stats in provider_stats.items():
-            avg_response_time = sum(stats['response_times']) / len(stats['response_times']) if stats['response_times'] else 0
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO provider_stats 
-                (provider_name, check_date, total_checks, successful_checks, 
-                 failed_checks, avg_response_time, blacklisted_count)
-                VALUES (?, ?, 
-                    COALESCE((SELECT total_checks FROM provider_stats WHERE provider_name = ? AND check_date = ?), 0) + ?,
-                    COALESCE((SELECT successful_checks FROM provider_stats WHERE provider_name = ? AND check_date = ?), 0) + ?,
-                    COALESCE((SELECT failed_checks FROM provider_stats WHERE provider_name = ? AND check_date = ?), 0) + ?,
-                    ?, 
-                    COALESCE((SELECT blacklisted_count FROM provider_stats WHERE provider_name = ? AND check_date = ?), 0) + ?)
-            ''', (
-                provider_name, today,
-                provider_name, today, stats['total'],
-                provider_name, today, stats['successful'],
-                provider_name, today, stats['failed'],
-                avg_response_time,
-                provider_name, today, stats['blacklisted']
-            ))
+        today = self._today()
         
-        conn.commit()
-        conn.close()
+        return [
+            (
+                provider_name,
+                today,
+                stats['total'],
+                stats['successful'],
+                stats['failed'],
+                stats['sum_rt'] / stats['successful'] if stats['successful'] else 0.0,
+                stats['blacklisted']
+            ) for provider_name, stats in provider_stats.items()
+        ]
 
-    def get_target_status(self, ip_address: str) -> Dict:
-        """Get current status for a monitoring target"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get target info
-        cursor.execute('''
-            SELECT * FROM monitoring_targets WHERE ip_address = ?
-        ''', (ip_address,))
-        
-        target = cursor.fetchone()
-        if not target:
-            return {"error": "Target not found"}
-        
-        # Get recent checks
-        cursor.execute('''
-            SELECT provider, is_blacklisted, status, check_time, details
-            FROM blacklist_checks 
-            WHERE ip_address = ? AND check_time >= datetime('now', '-1 day')
-            ORDER BY check_time DESC
-        ''', (ip_address,))
-        
-        recent_checks = cursor.fetchall()
-        
-        # Get active alerts
-        cursor.execute('''
-            SELECT alert_type, severity, message, created_at
-            FROM blacklist_alerts 
-            WHERE ip_address = ? AND is_resolved = FALSE
-            ORDER BY created_at DESC
-        ''', (ip_address,))
-        
-        active_alerts = cursor.fetchall()
-        
-        conn.close()
+    def _write_provider_stats(self, cursor: sqlite3.Cursor, rows: List[Tuple]):
+        """Merge aggregated provider statistics (caller holds the DB lock and commits)"""
+        if not rows:
+            return
         
-        return {
-            "ip_address": ip_address,
-            "domain": target[2],
-            "is_active": bool(target[4]),
-            "last_check": target[5],
-            "blacklist_count": target[6],
-            "reputation_score": target[7],
-            "check_frequency": target[3],
-            "alert_threshold": target[4],
-            "recent_checks": [
-                {
-                    "provider": check[0],
-                    "is_blacklisted": bool(check[1]),
-                    "status": check[2],
-                    "check_time": check[3],
-                    "details": check[4]
-                } for check in recent_checks
-            ],
-            "active_alerts": [
-                {
-                    "type": alert[0],
-                    "severity": alert[1],
-                    "message": alert[2],
-                    "created_at": alert[3]
-                } for alert in active_alerts
-            ]
-        }
+        # Stage all rows, then merge them in one statement
+        cursor.execute('DELETE FROM provider_stats_stage')
+        cursor.executemany(_SQL_STAGE_STATS, rows)
+        cursor.execute(_SQL_MERGE_STATS)
+
+    def _today(self) -> int:
+        """Current UTC day as days since the Unix epoch"""
+        return int(time.time() // 86400)
+
+    def get_target_status(self, ip_address: str) -> Optional[TargetStatus]:
+        """Get current status for a monitoring target, or None if it is unknown"""
+        with self._db_section():
+            cursor = self._conn.cursor()
+            
+            # Get target info
+            cursor.execute(_SQL_TARGET_SELECT, (ip_address,))
+            
+            target = cursor.fetchone()
+            if not target:
+                return None
+            
+            # Get recent checks and active alerts
+            cursor.execute(_SQL_TARGET_ACTIVITY, (ip_address,))
+            activity = cursor.fetchall()
+        
+        recent_checks = []
+        active_alerts = []
+        for row in activity:
+            if row[0] == 'check':
+                recent_checks.append({
+                    "provider": row[1],
+                    "is_blacklisted": row[5],
+                    "status": row[2],
+                    "check_time": row[3],
+                    "details": row[4]
+                })
+            else:
+                active_alerts.append({
+                    "type": row[1],
+                    "severity": row[2],
+                    "message": row[4],
+                    "created_at": row[3]
+                })
+        
+        return TargetStatus(
+            ip_address=ip_address,
+            domain=target["domain"],
+            is_active=target["is_active"],
+            last_check=target["last_check"],
+            blacklist_count=target["blacklist_count"],
+            reputation_score=target["reputation_score"],
+            check_frequency=target["check_frequency"],
+            alert_threshold=target["alert_threshold"],
+            recent_checks=recent_checks,
+            active_alerts=active_alerts
+        )
 
     def get_provider_performance(self, days: int = 7) -> Dict:
         """Get provider performance statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        days = int(days)
         
-        cursor.execute('''
-            SELECT 
-                provider_name,
-                SUM(total_checks) as total_checks,
-                SUM(successful_checks) as successful_checks,
-                SUM(failed_checks) as failed_checks,
-                AVG(avg_response_time) as avg_response_time,
-                SUM(blacklisted_count) as blacklisted_count
-            FROM provider_stats 
-            WHERE check_date >= DATE('now', '-{} days')
-            GROUP BY provider_name
-            ORDER BY total_checks DESC
-        '''.format(days), ())
-        
-        stats = cursor.fetchall()
-        conn.close()
+        with self._db_section():
+            stats = self._conn.execute(_SQL_PROVIDER_PERF, (days,)).fetchall()
         
         return {
             "period_days": days,
@@ -952,6 +1145,47 @@ class BlacklistMonitor:
             ]
         }
 
+def _print_checks(checks: List[BlacklistCheck]):
+    """Print one line per provider check"""
+    print(f"Checked {len(checks)} providers:")
+    for check in checks:
+        print(f"  {check.provider}: {check.status.value} ({check.response_time:.2f}s)")
+
+async def _cli_add_target(monitor: BlacklistMonitor, value):
+    ip, domain = value
+    target_id = await monitor.add_monitoring_target(ip, domain)
+    print(f"Added target ID: {target_id}")
+
+async def _cli_check_ip(monitor: BlacklistMonitor, value):
+    _print_checks(await monitor.check_ip_blacklists(value))
+
+async def _cli_check_domain(monitor: BlacklistMonitor, value):
+    _print_checks(await monitor.check_domain_blacklists(value))
+
+async def _cli_monitor(monitor: BlacklistMonitor, value):
+    await monitor.monitor_targets_continuously()
+
+async def _cli_status(monitor: BlacklistMonitor, value):
+    status = monitor.get_target_status(value)
+    if status is None:
+        print(json.dumps({"error": "Target not found"}, indent=2))
+        return
+    print(json.dumps(asdict(status), indent=2))
+
+async def _cli_provider_stats(monitor: BlacklistMonitor, value):
+    stats = monitor.get_provider_performance(value)
+    print(json.dumps(stats, indent=2))
+
+# CLI options in priority order; the first one set on the command line wins
+_CLI_HANDLERS = {
+    'add_target': _cli_add_target,
+    'check_ip': _cli_check_ip,
+    'check_domain': _cli_check_domain,
+    'monitor': _cli_monitor,
+    'status': _cli_status,
+    'provider_stats': _cli_provider_stats,
+}
+
 async def main():
     """Main function for CLI usage"""
     import argparse
@@ -969,36 +1203,17 @@ async def main():
     
     monitor = BlacklistMonitor(args.config)
     
-    if args.add_target:
-        ip, domain = args.add_target
-        target_id = await monitor.add_monitoring_target(ip, domain)
-        print(f"Added target ID: {target_id}")
-        
-    elif args.check_ip:
-        checks = await monitor.check_ip_blacklists(args.check_ip)
-        print(f"Checked {len(checks)} providers:")
-        for check in checks:
-            print(f"  {check.provider}: {check.status.value} ({check.response_time:.2f}s)")
-        
-    elif args.check_domain:
-        checks = await monitor.check_domain_blacklists(args.check_domain)
-        print(f"Checked {len(checks)} providers:")
-        for check in checks:
-            print(f"  {check.provider}: {check.status.value} ({check.response_time:.2f}s)")
-        
-    elif args.monitor:
-        await monitor.monitor_targets_continuously()
-        
-    elif args.status:
-        status = monitor.get_target_status(args.status)
-        print(json.dumps(status, indent=2, default=str))
-        
-    elif args.provider_stats:
-        stats = monitor.get_provider_performance(args.provider_stats)
-        print(json.dumps(stats, indent=2, default=str))
-        
-    else:
-        parser.print_help()
+    try:
+        for option, handler in _CLI_HANDLERS.items():
+            value = getattr(args, option)
+            if value:
+                await handler(monitor, value)
+                break
+        else:
+            parser.print_help()
+    finally:
+        # Also reached on Ctrl-C during --monitor; dumps the SQL trace when enabled
+        monitor.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -13,18 +13,156 @@ Version: 1.0.0
 """
 
 import os
+import re
 import sys
 import json
-import yaml
 import time
+import errno
 import socket
+import struct
+import selectors
 import logging
+import logging.handlers
+import threading
 import subprocess
+import socketserver
 import ipaddress
-import psutil
 from datetime import datetime, timedelta
+from collections import namedtuple
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# psutil and yaml are imported inside the methods that need them so CLI runs
+# answered by the daemon (and --help) skip their import cost
+
+# Link attributes live here on Linux; read directly instead of going through psutil
+SYSFS_NET_DIR = '/sys/class/net'
+
+# Compact per-address record kept in the interface cache; the CLI expands it
+Addr = namedtuple('Addr', 'ip netmask family')
+
+# Interface name of the first gateway route in `ip route show default` output
+_DEFAULT_ROUTE_RE = re.compile(r'^default\s+via\s+\S+.*?\sdev\s+(\S+)', re.MULTILINE)
+
+# Interface names (plus :N alias labels) safe to place in an `ip -batch` script line
+_INTERFACE_NAME_RE = re.compile(r'[A-Za-z0-9_.:-]{1,15}')
+
+# Log records buffered in memory before they are written to the log file
+LOG_BUFFER_CAPACITY = 100
+
+# Seconds an interface snapshot is reused before psutil is queried again
+INTERFACE_CACHE_TTL = 1.0
+
+# Shortest CPU sampling window get_system_status reports over, in seconds.
+# Callers polling faster than this should drive psutil.cpu_percent themselves.
+CPU_SAMPLE_WINDOW = 0.1
+
+# Per-probe timeout in seconds for test_connectivity; the probes run in parallel
+CONNECTIVITY_TIMEOUT = 2
+
+# fping per-target timeout (ms) and worker cap for the fallback pings / reverse DNS lookups
+HEALTH_PING_TIMEOUT_MS = 500
+HEALTH_CHECK_WORKERS = 16
+
+# Seconds the rotation keeps its IP list before re-reading the interfaces
+ROTATION_LIST_TTL = 60
+
+# Services reported by get_service_status
+MONITORED_SERVICES = ('docker', 'ufw', 'fail2ban', 'ssh')
+
+# Private and reserved IPv4 networks (same set ipaddress treats as is_private),
+# as (network, mask) integer pairs for fast classification
+PRIVATE_IPV4_RANGES = tuple(
+    (int(network.network_address), int(network.netmask))
+    for network in map(ipaddress.IPv4Network, (
+        '0.0.0.0/8', '10.0.0.0/8', '127.0.0.0/8', '169.254.0.0/16', '172.16.0.0/12',
+        '192.0.0.0/29', '192.0.0.170/31', '192.0.2.0/24', '192.168.0.0/16', '198.18.0.0/15',
+        '198.51.100.0/24', '203.0.113.0/24', '240.0.0.0/4', '255.255.255.255/32'
+    ))
+)
+
+# Resolved probe hosts as host -> (monotonic timestamp, IPv4 address)
+DNS_CACHE_TTL = 300
+_DNS_CACHE: Dict[str, Tuple[float, str]] = {}
+
+# UNIX socket served by `vps_manager.py daemon`; CLI runs try it before starting in-process
+DAEMON_SOCKET_PATH = os.environ.get('VPS_MANAGER_SOCKET', '/run/vps-manager.sock')
+DAEMON_TIMEOUT = 30
+
+# Commands the daemon answers; address changes always run in-process
+DAEMON_COMMANDS = frozenset({'status', 'ips', 'interfaces', 'rotate-ip', 'monitor'})
+
+# Parsed config files by path, reused while the file's mtime and size are unchanged
+_CONFIG_CACHE: Dict[Path, Tuple[int, int, Any]] = {}
+
+
+def _read_config_cached(config_file: Path, parse) -> Any:
+    """Parse a config file, returning the cached result if the file has not changed
+    
+    Args:
+        config_file: Path to the config file
+        parse: Callable that parses an open file object
+    
+    Returns:
+        Parsed configuration (shared between callers; treat as read-only)
+    """
+    st = config_file.stat()
+    cached = _CONFIG_CACHE.get(config_file)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    
+    with open(config_file, 'r') as f:
+        config = parse(f)
+    
+    _CONFIG_CACHE[config_file] = (st.st_mtime_ns, st.st_size, config)
+    return config
+
+
+def _resolve_cached(host: str, ttl: float = DNS_CACHE_TTL) -> str:
+    """Resolve a hostname to an IPv4 address, reusing the answer for ttl seconds"""
+    now = time.monotonic()
+    cached = _DNS_CACHE.get(host)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+    
+    ip = socket.gethostbyname(host)
+    _DNS_CACHE[host] = (now, ip)
+    return ip
+
+
+def _read_sysfs_attr(interface: str, attr: str) -> Optional[str]:
+    """Read one /sys/class/net/<interface>/<attr> value, or None if the kernel refuses it"""
+    try:
+        with open(os.path.join(SYSFS_NET_DIR, interface, attr), 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _is_private_ipv4(ip: str) -> bool:
+    """Check whether a dotted IPv4 address is private, raising OSError if it is not valid"""
+    value = struct.unpack('!I', socket.inet_aton(ip))[0]
+    return any((value & mask) == network for network, mask in PRIVATE_IPV4_RANGES)
+
+
+@dataclass
+class NetSnapshot:
+    """Network state gathered once and shared by everything in a single status call"""
+    interfaces: Dict[str, Dict[str, Any]]
+    ips: List[str]
+    primary: Optional[str]
+    
+    @classmethod
+    def capture(cls, manager: 'VPSManager') -> 'NetSnapshot':
+        """Enumerate interfaces once and derive the IP list and primary interface from it"""
+        interfaces = manager.get_network_interfaces()
+        return cls(
+            interfaces=interfaces,
+            ips=manager.get_available_ips(interfaces),
+            primary=manager.get_primary_interface()
+        )
 
 
 class VPSManager:
@@ -54,6 +192,22 @@ class VPSManager:
         # Set up logging
         self.setup_logging()
         
+        # Short-lived (monotonic timestamp, interfaces) snapshot shared by the network helpers
+        self._if_cache: Optional[Tuple[float, Dict[str, Dict[str, Any]]]] = None
+        self._primary_cache: Optional[Tuple[float, str]] = None
+        
+        # Round-robin state for rotate_ip_for_sending; the index survives restarts via a state file
+        self._rotation_lock = threading.Lock()
+        self._rotation_list: List[str] = []
+        self._rotation_stamp = 0.0
+        self._rotation_state_file = self.monitoring_dir / 'rotation.state'
+        self._rotation_idx = self._load_rotation_index()
+        
+        # Prime psutil's CPU counters so status calls can read usage without blocking
+        import psutil
+        psutil.cpu_percent(interval=None)
+        self._cpu_sampled_at = time.monotonic()
+        
         # Load configurations
         self.network_config = self.load_network_config()
         self.firewall_config = self.load_firewall_config()
@@ -61,17 +215,30 @@ class VPSManager:
         self.logger.info("VPS Manager initialized")
     
     def setup_logging(self):
-        """Set up logging configuration"""
-        log_file = self.log_dir / f'vps-manager-{datetime.now().strftime("%Y%m%d")}.log'
-        
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+        """Set up logging configuration
+        
+        The root logger is configured once per process; later managers (daemon
+        requests, repeated instantiation) reuse its handlers instead of opening
+        the log file again.
+        """
+        if not logging.getLogger().handlers:
+            log_file = self.log_dir / f'vps-manager-{datetime.now().strftime("%Y%m%d")}.log'
+            log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            
+            file_handler = logging.FileHandler(log_file)
+            file_handler.setFormatter(logging.Formatter(log_format))
+            
+            logging.basicConfig(
+                level=logging.INFO,
+                format=log_format,
+                handlers=[
+                    # Batch file writes; warnings and errors still reach disk immediately
+                    logging.handlers.MemoryHandler(
+                        LOG_BUFFER_CAPACITY, flushLevel=logging.WARNING, target=file_handler
+                    ),
+                    logging.StreamHandler(sys.stdout)
+                ]
+            )
         
         self.logger = logging.getLogger('VPSManager')
     
@@ -84,8 +251,10 @@ class VPSManager:
             return {}
         
         try:
-            with open(config_file, 'r') as f:
-                config = yaml.safe_load(f)
+            import yaml
+            # libyaml's C loader parses several times faster when PyYAML was built with it
+            loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+            config = _read_config_cached(config_file, lambda f: yaml.load(f, Loader=loader))
             self.logger.info("Network configuration loaded successfully")
             return config
         except Exception as e:
@@ -101,8 +270,7 @@ class VPSManager:
             return {}
         
         try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
+            config = _read_config_cached(config_file, json.load)
             self.logger.info("Firewall configuration loaded successfully")
             return config
         except Exception as e:
@@ -115,22 +283,27 @@ class VPSManager:
         Returns:
             Dictionary mapping interface names to their details
         """
+        if self._if_cache and time.monotonic() - self._if_cache[0] < INTERFACE_CACHE_TTL:
+            return self._if_cache[1]
+        
         interfaces = {}
         
         try:
-            # Get interface statistics using psutil
-            net_if_stats = psutil.net_if_stats()
+            import psutil
+            
+            # Link state from sysfs (psutil elsewhere), addresses from one getifaddrs call
+            link_stats = self._read_link_stats()
             net_if_addrs = psutil.net_if_addrs()
             
-            for interface_name, stats in net_if_stats.items():
+            for interface_name, (is_up, mtu, speed) in link_stats.items():
                 if interface_name == 'lo':  # Skip loopback
                     continue
                 
                 interface_info = {
                     'name': interface_name,
-                    'is_up': stats.isup,
-                    'mtu': stats.mtu,
-                    'speed': getattr(stats, 'speed', 0),
+                    'is_up': is_up,
+                    'mtu': mtu,
+                    'speed': speed,
                     'addresses': []
                 }
                 
@@ -138,58 +311,120 @@ class VPSManager:
                 if interface_name in net_if_addrs:
                     for addr in net_if_addrs[interface_name]:
                         if addr.family == socket.AF_INET:  # IPv4
-                            interface_info['addresses'].append({
-                                'ip': addr.address,
-                                'netmask': addr.netmask,
-                                'broadcast': addr.broadcast,
-                                'family': 'IPv4'
-                            })
+                            interface_info['addresses'].append(Addr(addr.address, addr.netmask, 'IPv4'))
                         elif addr.family == socket.AF_INET6:  # IPv6
-                            interface_info['addresses'].append({
-                                'ip': addr.address,
-                                'netmask': addr.netmask,
-                                'broadcast': addr.broadcast,
-                                'family': 'IPv6'
-                            })
+                            interface_info['addresses'].append(Addr(addr.address, addr.netmask, 'IPv6'))
                 
                 interfaces[interface_name] = interface_info
             
             self.logger.info(f"Found {len(interfaces)} network interfaces")
+            self._if_cache = (time.monotonic(), interfaces)
             return interfaces
         
         except Exception as e:
             self.logger.error(f"Failed to get network interfaces: {e}")
             return {}
     
-    def get_available_ips(self) -> List[str]:
+    def get_network_interfaces_detailed(self) -> Dict[str, Dict[str, Any]]:
+        """Get all network interfaces with addresses expanded to dicts, including broadcast
+        
+        Meant for display and JSON output; internal callers should use
+        get_network_interfaces, which keeps addresses as compact Addr tuples.
+        
+        Returns:
+            Dictionary mapping interface names to their details
+        """
+        interfaces = self.get_network_interfaces()
+        if not interfaces:
+            return {}
+        
+        try:
+            import psutil
+            broadcasts = {
+                (name, addr.address): addr.broadcast
+                for name, addrs in psutil.net_if_addrs().items()
+                for addr in addrs
+            }
+        except Exception as e:
+            self.logger.error(f"Failed to read broadcast addresses: {e}")
+            broadcasts = {}
+        
+        detailed = {}
+        for name, info in interfaces.items():
+            detailed[name] = dict(info, addresses=[
+                {
+                    'ip': addr.ip,
+                    'netmask': addr.netmask,
+                    'broadcast': broadcasts.get((name, addr.ip)),
+                    'family': addr.family
+                }
+                for addr in info['addresses']
+            ])
+        
+        return detailed
+    
+    def _read_link_stats(self) -> Dict[str, Tuple[bool, int, int]]:
+        """Get (is_up, mtu, speed) for every network link
+        
+        On Linux this reads /sys/class/net directly; other platforms use psutil.
+        """
+        if not sys.platform.startswith('linux') or not os.path.isdir(SYSFS_NET_DIR):
+            import psutil
+            return {
+                name: (stats.isup, stats.mtu, getattr(stats, 'speed', 0))
+                for name, stats in psutil.net_if_stats().items()
+            }
+        
+        link_stats = {}
+        for name in os.listdir(SYSFS_NET_DIR):
+            # Up means IFF_UP is set and the link has carrier (IFF_RUNNING), as psutil reports it
+            flags = int(_read_sysfs_attr(name, 'flags') or '0', 16)
+            is_up = bool(flags & 0x1) and _read_sysfs_attr(name, 'carrier') == '1'
+            mtu = int(_read_sysfs_attr(name, 'mtu') or 0)
+            # Virtual links refuse the speed read or report -1; psutil shows those as 0
+            speed = max(int(_read_sysfs_attr(name, 'speed') or 0), 0)
+            link_stats[name] = (is_up, mtu, speed)
+        
+        return link_stats
+    
+    def invalidate_interfaces(self):
+        """Drop the cached interface snapshot so the next lookup re-reads the system"""
+        self._if_cache = None
+        self._primary_cache = None
+        self._rotation_list = []
+    
+    def get_available_ips(self, interfaces: Optional[Dict[str, Dict[str, Any]]] = None) -> List[str]:
         """Get list of all available IPv4 addresses on the server
         
+        Args:
+            interfaces: Interface details already fetched by the caller (enumerated if None)
+        
         Returns:
             List of IPv4 addresses
         """
-        ip_addresses = []
+        public_ips = []
+        private_ips = []
         
         try:
-            interfaces = self.get_network_interfaces()
+            # Collect IPv4 addresses and split them into public/private in one pass
+            if interfaces is None:
+                interfaces = self.get_network_interfaces()
             
-            for interface_name, interface_info in interfaces.items():
+            for interface_info in interfaces.values():
                 for addr_info in interface_info['addresses']:
-                    if addr_info['family'] == 'IPv4':
-                        ip_addresses.append(addr_info['ip'])
-            
-            # Filter out private/local addresses if needed
-            public_ips = []
-            private_ips = []
-            
-            for ip in ip_addresses:
-                try:
-                    ip_obj = ipaddress.ip_address(ip)
-                    if ip_obj.is_private:
+                    if addr_info.family != 'IPv4':
+                        continue
+                    
+                    ip = addr_info.ip
+                    try:
+                        is_private = _is_private_ipv4(ip)
+                    except OSError:
+                        continue
+                    
+                    if is_private:
                         private_ips.append(ip)
                     else:
                         public_ips.append(ip)
-                except ValueError:
-                    continue
             
             self.logger.info(f"Found {len(public_ips)} public IPs and {len(private_ips)} private IPs")
             
@@ -210,23 +445,15 @@ class VPSManager:
             if self.network_config.get('primary_interface'):
                 return self.network_config['primary_interface']
             
-            # Get primary interface from system
-            result = subprocess.run(
-                ['ip', 'route', 'show', 'default'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            if self._primary_cache and time.monotonic() - self._primary_cache[0] < INTERFACE_CACHE_TTL:
+                return self._primary_cache[1]
             
-            for line in result.stdout.strip().split('\n'):
-                if 'default via' in line:
-                    parts = line.split()
-                    if 'dev' in parts:
-                        dev_index = parts.index('dev')
-                        if dev_index + 1 < len(parts):
-                            interface_name = parts[dev_index + 1]
-                            self.logger.info(f"Primary interface detected: {interface_name}")
-                            return interface_name
+            # Get primary interface from system
+            interface_name = self._find_default_route_interface()
+            if interface_name:
+                self.logger.info(f"Primary interface detected: {interface_name}")
+                self._primary_cache = (time.monotonic(), interface_name)
+                return interface_name
             
             self.logger.warning("Could not detect primary interface")
             return None
@@ -235,6 +462,49 @@ class VPSManager:
             self.logger.error(f"Failed to get primary interface: {e}")
             return None
     
+    def _find_default_route_interface(self) -> Optional[str]:
+        """Look up the interface of the IPv4 default route
+        
+        Asks the kernel over netlink when pyroute2 is installed, otherwise reads
+        /proc/net/route, and only falls back to running `ip route` when neither works.
+        """
+        try:
+            from pyroute2 import IPRoute
+            with IPRoute() as ipr:
+                routes = ipr.get_default_routes(family=socket.AF_INET)
+                if not routes:
+                    return None
+                oif = routes[0].get_attr('RTA_OIF')
+                return ipr.link('get', index=oif)[0].get_attr('IFLA_IFNAME')
+        except ImportError:
+            pass
+        except Exception as e:
+            # Netlink permission/NetlinkError/OSError: carry on with the cheaper fallbacks
+            self.logger.debug(f"pyroute2 default route lookup failed: {e}")
+        
+        try:
+            with open('/proc/net/route', 'r') as f:
+                next(f)  # Header row
+                for line in f:
+                    cols = line.split()
+                    # Destination 0.0.0.0 with RTF_UP | RTF_GATEWAY set is the default route
+                    if cols[1] == '00000000' and (int(cols[3], 16) & 0x3) == 0x3:
+                        return cols[0]
+            return None
+        except (OSError, ValueError, IndexError, StopIteration):
+            # Missing or unexpectedly formatted table: let `ip route` answer instead
+            pass
+        
+        result = subprocess.run(
+            ['ip', 'route', 'show', 'default'],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        
+        match = _DEFAULT_ROUTE_RE.search(result.stdout)
+        return match.group(1) if match else None
+    
     def add_ip_alias(self, ip: str, interface: Optional[str] = None, netmask: str = '24') -> bool:
         """Add an IP alias to a network interface
         
@@ -256,14 +526,8 @@ class VPSManager:
             # Validate IP address
             ipaddress.ip_address(ip)
             
-            # Find next available alias number
-            alias_num = 1
-            interfaces = self.get_network_interfaces()
-            
-            while f"{interface}:{alias_num}" in interfaces:
-                alias_num += 1
-            
-            alias_interface = f"{interface}:{alias_num}"
+            import psutil
+            alias_interface = self._next_alias_label(interface, set(psutil.net_if_addrs()))
             
             # Add IP alias using ip command
             cmd = [
@@ -276,6 +540,7 @@ class VPSManager:
             result = subprocess.run(cmd, capture_output=True, text=True)
             
             if result.returncode == 0:
+                self.invalidate_interfaces()
                 self.logger.info(f"Successfully added IP alias {ip} to {alias_interface}")
                 return True
             else:
@@ -286,6 +551,72 @@ class VPSManager:
             self.logger.error(f"Failed to add IP alias {ip}: {e}")
             return False
     
+    def add_ip_aliases_bulk(self, specs: List[Tuple[str, Optional[str], str]]) -> bool:
+        """Add several IP aliases with a single `ip -batch` invocation
+        
+        Args:
+            specs: (ip, interface, netmask) tuples; a None interface uses the primary one
+        
+        Returns:
+            True if every alias was added, False otherwise
+        """
+        if not specs:
+            return True
+        
+        try:
+            import psutil
+            existing = set(psutil.net_if_addrs())
+            commands = []
+            
+            for ip, interface, netmask in specs:
+                # Validate IP address
+                address = ipaddress.ip_address(ip)
+                
+                if not interface:
+                    interface = self.get_primary_interface()
+                    if not interface:
+                        self.logger.error("Cannot determine primary interface")
+                        return False
+                
+                # Every field lands in one batch script, so none may carry spaces or newlines
+                if getattr(address, 'scope_id', None):
+                    raise ValueError(f"Scoped address not allowed: {ip!r}")
+                if not _INTERFACE_NAME_RE.fullmatch(interface):
+                    raise ValueError(f"Invalid interface name: {interface!r}")
+                if not re.fullmatch(r'[0-9]{1,3}', str(netmask)) or int(netmask) > address.max_prefixlen:
+                    raise ValueError(f"Invalid prefix length for {ip}: {netmask!r}")
+                
+                alias_interface = self._next_alias_label(interface, existing)
+                existing.add(alias_interface)
+                commands.append(f"addr add {ip}/{netmask} dev {interface} label {alias_interface}\n")
+            
+            result = subprocess.run(['ip', '-batch', '-'], input=''.join(commands), capture_output=True, text=True)
+            self.invalidate_interfaces()
+            
+            if result.returncode == 0:
+                self.logger.info(f"Successfully added {len(commands)} IP aliases")
+                return True
+            else:
+                self.logger.error(f"Failed to add IP aliases: {result.stderr}")
+                return False
+        
+        except Exception as e:
+            self.logger.error(f"Failed to add IP aliases: {e}")
+            return False
+    
+    def _next_alias_label(self, interface: str, existing: set) -> str:
+        """Return the first free interface:N label
+        
+        Args:
+            interface: Base interface name
+            existing: Interface names and labels already in use. Alias labels only
+                show up in the address list (getifaddrs), not among link devices.
+        """
+        alias_num = 1
+        while f"{interface}:{alias_num}" in existing:
+            alias_num += 1
+        return f"{interface}:{alias_num}"
+    
     def remove_ip_alias(self, ip: str, interface: Optional[str] = None) -> bool:
         """Remove an IP alias from a network interface
         
@@ -307,7 +638,7 @@ class VPSManager:
                 
                 for iface_name, iface_info in interfaces.items():
                     for addr_info in iface_info['addresses']:
-                        if addr_info['ip'] == ip:
+                        if addr_info.ip == ip:
                             target_interface = iface_name
                             break
                     if target_interface:
@@ -322,6 +653,7 @@ class VPSManager:
             result = subprocess.run(cmd, capture_output=True, text=True)
             
             if result.returncode == 0:
+                self.invalidate_interfaces()
                 self.logger.info(f"Successfully removed IP {ip}")
                 return True
             else:
@@ -358,7 +690,14 @@ class VPSManager:
     def get_system_status(self) -> Dict[str, Any]:
         """Get system resource status"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            import psutil
+            
+            # Usage since the previous sample; only wait if that window is too short to be meaningful
+            elapsed = time.monotonic() - self._cpu_sampled_at
+            if elapsed < CPU_SAMPLE_WINDOW:
+                time.sleep(CPU_SAMPLE_WINDOW - elapsed)
+            cpu_percent = psutil.cpu_percent(interval=None)
+            self._cpu_sampled_at = time.monotonic()
             memory = psutil.virtual_memory()
             boot_time = datetime.fromtimestamp(psutil.boot_time())
             
@@ -378,18 +717,17 @@ class VPSManager:
     def get_network_status(self) -> Dict[str, Any]:
         """Get network status information"""
         try:
-            interfaces = self.get_network_interfaces()
-            available_ips = self.get_available_ips()
+            snapshot = NetSnapshot.capture(self)
             
             # Test internet connectivity
             connectivity = self.test_connectivity()
             
             return {
-                'interfaces_count': len(interfaces),
-                'available_ips': available_ips,
-                'ip_count': len(available_ips),
+                'interfaces_count': len(snapshot.interfaces),
+                'available_ips': snapshot.ips,
+                'ip_count': len(snapshot.ips),
                 'connectivity': connectivity,
-                'primary_interface': self.get_primary_interface()
+                'primary_interface': snapshot.primary
             }
         except Exception as e:
             self.logger.error(f"Failed to get network status: {e}")
@@ -398,6 +736,8 @@ class VPSManager:
     def get_disk_status(self) -> Dict[str, Any]:
         """Get disk usage status"""
         try:
+            import psutil
+            
             disk_usage = psutil.disk_usage('/')
             
             return {
@@ -412,25 +752,27 @@ class VPSManager:
     
     def get_service_status(self) -> Dict[str, Any]:
         """Get status of important services"""
-        services = ['docker', 'ufw', 'fail2ban', 'ssh']
-        service_status = {}
+        service_status = dict.fromkeys(MONITORED_SERVICES, False)
         
-        for service in services:
-            try:
-                result = subprocess.run(
-                    ['systemctl', 'is-active', service],
-                    capture_output=True,
-                    text=True
-                )
-                service_status[service] = result.stdout.strip() == 'active'
-            except Exception:
-                service_status[service] = False
+        try:
+            # systemctl prints one state per unit, in the order the units were given
+            result = subprocess.run(
+                ['systemctl', 'is-active', *MONITORED_SERVICES],
+                capture_output=True,
+                text=True
+            )
+            for service, state in zip(MONITORED_SERVICES, result.stdout.splitlines()):
+                service_status[service] = state.strip() == 'active'
+        except Exception:
+            pass
         
         return service_status
     
     def get_load_status(self) -> Dict[str, Any]:
         """Get system load averages"""
         try:
+            import psutil
+            
             load_avg = psutil.getloadavg()
             
             return {
@@ -445,38 +787,94 @@ class VPSManager:
     
     def test_connectivity(self) -> Dict[str, bool]:
         """Test network connectivity to various endpoints"""
-        connectivity = {
-            'internet': False,
-            'dns': False,
-            'smtp_port': False
+        probes = {
+            'internet': self._probe_internet,
+            'dns': self._probe_dns,
+            'smtp_port': self._probe_smtp_port
         }
+        connectivity = dict.fromkeys(probes, False)
         
-        try:
-            # Test internet connectivity
-            import urllib.request
-            urllib.request.urlopen('http://www.google.com', timeout=5)
-            connectivity['internet'] = True
-        except Exception:
-            pass
+        # The probes only wait on the network, so run them side by side
+        with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+            futures = {executor.submit(probe): name for name, probe in probes.items()}
+            for future in as_completed(futures):
+                try:
+                    connectivity[futures[future]] = future.result()
+                except Exception:
+                    pass
         
-        try:
-            # Test DNS resolution
-            socket.gethostbyname('google.com')
-            connectivity['dns'] = True
-        except Exception:
-            pass
+        return connectivity
+    
+    def _probe_internet(self) -> bool:
+        """Test internet connectivity with a HEAD request"""
+        import urllib.request
+        request = urllib.request.Request('http://www.google.com', method='HEAD')
+        urllib.request.urlopen(request, timeout=CONNECTIVITY_TIMEOUT).close()
+        return True
+    
+    def _probe_dns(self) -> bool:
+        """Test DNS resolution"""
+        socket.gethostbyname('google.com')
+        return True
+    
+    def _probe_smtp_port(self) -> bool:
+        """Test SMTP port (25) connectivity"""
+        target = ('smtp.gmail.com', 25)
+        return self.probe_tcp_endpoints([target])[target]
+    
+    def probe_tcp_endpoints(self, targets: List[Tuple[str, int]],
+                            timeout: float = CONNECTIVITY_TIMEOUT) -> Dict[Tuple[str, int], bool]:
+        """Test TCP connectivity to many endpoints at once from a single thread
+        
+        Args:
+            targets: (host, port) pairs, e.g. several SMTP relays
+            timeout: Seconds to wait for all connections together
+        
+        Returns:
+            Dictionary mapping each (host, port) to whether it accepted a connection
+        """
+        results = dict.fromkeys(targets, False)
+        selector = selectors.DefaultSelector()
         
         try:
-            # Test SMTP port (25) connectivity
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            result = sock.connect_ex(('smtp.gmail.com', 25))
-            connectivity['smtp_port'] = result == 0
-            sock.close()
-        except Exception:
-            pass
+            # Start every connect without blocking
+            for host, port in results:
+                try:
+                    address = (_resolve_cached(host), port)
+                except OSError:
+                    continue
+                
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                err = sock.connect_ex(address)
+                
+                if err == 0:
+                    results[(host, port)] = True
+                    sock.close()
+                elif err in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                    selector.register(sock, selectors.EVENT_WRITE, (host, port))
+                else:
+                    sock.close()
+            
+            # Collect the handshakes as they finish; SO_ERROR tells success from refusal
+            deadline = time.monotonic() + timeout
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                
+                for key, _ in selector.select(remaining):
+                    sock = key.fileobj
+                    results[key.data] = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+                    selector.unregister(sock)
+                    sock.close()
         
-        return connectivity
+        finally:
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()
+            selector.close()
+        
+        return results
     
     def rotate_ip_for_sending(self, exclude_ips: Optional[List[str]] = None) -> Optional[str]:
         """Select an IP address for email sending with rotation
@@ -487,23 +885,45 @@ class VPSManager:
         Returns:
             Selected IP address or None if no IPs available
         """
-        available_ips = self.get_available_ips()
+        excluded = set(exclude_ips) if exclude_ips else set()
         
-        if exclude_ips:
-            available_ips = [ip for ip in available_ips if ip not in exclude_ips]
+        with self._rotation_lock:
+            if not self._rotation_list or time.monotonic() - self._rotation_stamp > ROTATION_LIST_TTL:
+                self._rotation_list = self.get_available_ips()
+                self._rotation_stamp = time.monotonic()
+            
+            # Round-robin: take the next IP after the last one handed out, skipping exclusions
+            count = len(self._rotation_list)
+            selected_ip = None
+            for offset in range(count):
+                position = (self._rotation_idx + offset) % count
+                if self._rotation_list[position] not in excluded:
+                    selected_ip = self._rotation_list[position]
+                    self._rotation_idx = position + 1
+                    self._save_rotation_index()
+                    break
         
-        if not available_ips:
+        if not selected_ip:
             self.logger.warning("No available IPs for sending")
             return None
         
-        # Simple round-robin selection
-        # In a production environment, you might want more sophisticated logic
-        import random
-        selected_ip = random.choice(available_ips)
-        
         self.logger.info(f"Selected IP for sending: {selected_ip}")
         return selected_ip
     
+    def _load_rotation_index(self) -> int:
+        """Read the persisted rotation index, starting from 0 if there is none"""
+        try:
+            return int(self._rotation_state_file.read_text().strip())
+        except (OSError, ValueError):
+            return 0
+    
+    def _save_rotation_index(self):
+        """Persist the rotation index so separate CLI runs keep rotating"""
+        try:
+            self._rotation_state_file.write_text(str(self._rotation_idx))
+        except OSError as e:
+            self.logger.warning(f"Failed to save rotation state: {e}")
+    
     def monitor_ip_health(self, ip: str) -> Dict[str, Any]:
         """Monitor the health of a specific IP address
         
@@ -513,36 +933,109 @@ class VPSManager:
         Returns:
             Dictionary containing health status
         """
-        health_status = {
-            'ip': ip,
-            'timestamp': datetime.now().isoformat(),
-            'reachable': False,
-            'response_time_ms': None,
-            'blacklisted': None,
-            'reverse_dns': None
+        return self.monitor_ips_health([ip])[ip]
+    
+    def monitor_ips_health(self, ips: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Monitor the health of several IP addresses at once
+        
+        Args:
+            ips: IP addresses to monitor
+        
+        Returns:
+            Dictionary mapping each IP to its health status
+        """
+        timestamp = datetime.now().isoformat()
+        health = {
+            ip: {
+                'ip': ip,
+                'timestamp': timestamp,
+                'reachable': False,
+                'response_time_ms': None,
+                'blacklisted': None,
+                'reverse_dns': None
+            } for ip in ips
         }
         
-        try:
-            # Test if IP is reachable
-            import ping3
-            response_time = ping3.ping(ip, timeout=5)
-            if response_time:
-                health_status['reachable'] = True
-                health_status['response_time_ms'] = round(response_time * 1000, 2)
-        except Exception:
-            pass
+        # Only well-formed addresses are probed; anything else could reach fping as an option
+        valid_ips = []
+        for ip in health:
+            try:
+                ipaddress.ip_address(ip)
+            except ValueError:
+                self.logger.error(f"Invalid IP address: {ip}")
+                continue
+            valid_ips.append(ip)
         
-        try:
-            # Check reverse DNS
-            reverse_dns = socket.gethostbyaddr(ip)
-            health_status['reverse_dns'] = reverse_dns[0]
-        except Exception:
-            health_status['reverse_dns'] = None
+        if not valid_ips:
+            return health
+        
+        # Test if IPs are reachable
+        for ip, response_time_ms in self._ping_ips(valid_ips).items():
+            if ip in health and response_time_ms:
+                health[ip]['reachable'] = True
+                health[ip]['response_time_ms'] = round(response_time_ms, 2)
+        
+        # Check reverse DNS
+        with ThreadPoolExecutor(max_workers=min(len(valid_ips), HEALTH_CHECK_WORKERS)) as executor:
+            for ip, reverse_dns in zip(valid_ips, executor.map(self._reverse_dns, valid_ips)):
+                health[ip]['reverse_dns'] = reverse_dns
         
         # Note: Blacklist checking would require external APIs
         # This is left as a placeholder for implementation
         
-        return health_status
+        return health
+    
+    def _ping_ips(self, ips: List[str]) -> Dict[str, Optional[float]]:
+        """Ping all IPs in one fping run, falling back to ping3 when fping is missing
+        
+        Returns:
+            Dictionary mapping IPs to round-trip time in ms (missing or None if unreachable)
+        """
+        try:
+            result = subprocess.run(
+                ['fping', '-C', '1', '-q', '-t', str(HEALTH_PING_TIMEOUT_MS), '--'] + list(ips),
+                capture_output=True,
+                text=True
+            )
+        except FileNotFoundError:
+            return self._ping_ips_individually(ips)
+        
+        # fping -C reports "host : rtt" per target on stderr, with "-" for no reply
+        response_times = {}
+        for line in result.stderr.splitlines():
+            host, separator, rtt = line.partition(' : ')
+            rtt = rtt.strip()
+            if separator and rtt and rtt != '-':
+                try:
+                    response_times[host.strip()] = float(rtt)
+                except ValueError:
+                    continue
+        
+        return response_times
+    
+    def _ping_ips_individually(self, ips: List[str]) -> Dict[str, Optional[float]]:
+        """Ping IPs concurrently with ping3, returning round-trip times in ms"""
+        try:
+            import ping3
+        except ImportError:
+            return {}
+        
+        def ping(ip: str) -> Optional[float]:
+            try:
+                response_time = ping3.ping(ip, timeout=5)
+                return response_time * 1000 if response_time else None
+            except Exception:
+                return None
+        
+        with ThreadPoolExecutor(max_workers=min(len(ips), HEALTH_CHECK_WORKERS)) as executor:
+            return dict(zip(ips, executor.map(ping, ips)))
+    
+    def _reverse_dns(self, ip: str) -> Optional[str]:
+        """Resolve the PTR hostname for an IP, or None"""
+        try:
+            return socket.gethostbyaddr(ip)[0]
+        except Exception:
+            return None
     
     def save_status_to_file(self, status: Dict[str, Any], filename: str = None) -> bool:
         """Save VPS status to JSON file
@@ -560,8 +1053,10 @@ class VPSManager:
             
             status_file = self.monitoring_dir / filename
             
+            # Encode up front and hand the file one write instead of json.dump's many small ones
+            payload = json.dumps(status, indent=2)
             with open(status_file, 'w') as f:
-                json.dump(status, f, indent=2)
+                f.write(payload)
             
             self.logger.info(f"Status saved to {status_file}")
             return True
@@ -598,12 +1093,157 @@ class VPSManager:
             return None
 
 
+def execute_command(manager: VPSManager, request: Dict[str, Any]) -> Any:
+    """Run one CLI command against a manager and return its result
+    
+    Args:
+        manager: VPSManager to run the command on
+        request: Command name under 'cmd' plus the command's arguments
+    
+    Returns:
+        The command's result (JSON-serializable)
+    """
+    command = request['cmd']
+    
+    if command == 'status':
+        status = manager.get_vps_status()
+        if request.get('save'):
+            manager.save_status_to_file(status)
+        return status
+    elif command == 'ips':
+        return manager.get_available_ips()
+    elif command == 'interfaces':
+        return manager.get_network_interfaces_detailed()
+    elif command == 'add-ip':
+        if len(request['ip']) == 1:
+            return manager.add_ip_alias(request['ip'][0], request.get('interface'), request.get('netmask', '24'))
+        return manager.add_ip_aliases_bulk(
+            [(ip, request.get('interface'), request.get('netmask', '24')) for ip in request['ip']]
+        )
+    elif command == 'remove-ip':
+        return manager.remove_ip_alias(request['ip'], request.get('interface'))
+    elif command == 'rotate-ip':
+        return manager.rotate_ip_for_sending(exclude_ips=request.get('exclude'))
+    elif command == 'monitor':
+        return manager.monitor_ips_health(request['ip'])
+    
+    raise ValueError(f"Unknown command: {command}")
+
+
+def flush_logs():
+    """Write out log records buffered by the root logger's handlers"""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Answer line-delimited JSON requests with one JSON reply line each"""
+    
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if request.get('cmd') not in DAEMON_COMMANDS:
+                    raise ValueError(f"Command not served by daemon: {request.get('cmd')}")
+                reply = {'ok': True, 'result': execute_command(self.server.manager, request)}
+            except Exception as e:
+                reply = {'ok': False, 'error': str(e)}
+            
+            self.wfile.write(json.dumps(reply).encode() + b'\n')
+            
+            # The daemon never exits normally, so don't leave a request's log lines buffered
+            flush_logs()
+
+
+def _daemon_listening(socket_path: str) -> bool:
+    """Check whether something is accepting connections on a UNIX socket path"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1)
+            sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+
+def run_daemon(manager: VPSManager, socket_path: str = DAEMON_SOCKET_PATH) -> bool:
+    """Serve DAEMON_COMMANDS from one long-lived manager over a UNIX socket
+    
+    Keeps parsed configs, interface snapshots and CPU sampling state warm between requests.
+    
+    Returns:
+        False if another daemon is already listening on socket_path, True once serving stops
+    """
+    if os.path.exists(socket_path):
+        if _daemon_listening(socket_path):
+            manager.logger.error(f"Another VPS Manager daemon is already listening on {socket_path}")
+            return False
+        
+        # Left behind by a daemon that did not shut down cleanly
+        os.unlink(socket_path)
+    
+    # Create the socket as 0660 from the start rather than chmod-ing it after bind
+    old_umask = os.umask(0o117)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(socket_path, _DaemonRequestHandler)
+    finally:
+        os.umask(old_umask)
+    
+    with server:
+        server.manager = manager
+        manager.logger.info(f"VPS Manager daemon listening on {socket_path}")
+        flush_logs()
+        
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(socket_path)
+    
+    return True
+
+
+def query_daemon(request: Dict[str, Any], socket_path: str = DAEMON_SOCKET_PATH) -> Optional[Dict[str, Any]]:
+    """Send one request to a running daemon
+    
+    Only a failed connect counts as "no daemon". Once the request may have been
+    sent, failures are returned as an error reply so the caller never runs a
+    command (e.g. rotate-ip) a second time in-process.
+    
+    Returns:
+        The daemon's reply ({'ok': ..., 'result'/'error': ...}), or None if no daemon answered
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(DAEMON_TIMEOUT)
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return None
+        
+        try:
+            sock.sendall(json.dumps(request).encode() + b'\n')
+            with sock.makefile('rb') as reader:
+                line = reader.readline()
+        except socket.timeout:
+            return {'ok': False, 'error': f"No reply from daemon within {DAEMON_TIMEOUT}s"}
+        except OSError as e:
+            return {'ok': False, 'error': f"Daemon connection failed: {e}"}
+        
+        if not line:
+            return {'ok': False, 'error': "Daemon closed the connection without replying"}
+        
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            return {'ok': False, 'error': f"Invalid reply from daemon: {e}"}
+
+
 def main():
     """Main function for command-line interface"""
     import argparse
     
     parser = argparse.ArgumentParser(description='VPS Manager for Cold Email Infrastructure')
     parser.add_argument('--config', '-c', help='Configuration directory path')
+    parser.add_argument('--socket', default=DAEMON_SOCKET_PATH, help=f'Daemon socket path (default: {DAEMON_SOCKET_PATH})')
     
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
@@ -621,7 +1261,7 @@ def main():
     
     # Add IP command
     add_ip_parser = subparsers.add_parser('add-ip', help='Add IP alias')
-    add_ip_parser.add_argument('ip', help='IP address to add')
+    add_ip_parser.add_argument('ip', nargs='+', help='IP address(es) to add')
     add_ip_parser.add_argument('--interface', help='Interface name')
     add_ip_parser.add_argument('--netmask', default='24', help='Network mask (default: 24)')
     
@@ -636,7 +1276,10 @@ def main():
     
     # Monitor command
     monitor_parser = subparsers.add_parser('monitor', help='Monitor IP health')
-    monitor_parser.add_argument('ip', help='IP address to monitor')
+    monitor_parser.add_argument('ip', nargs='+', help='IP address(es) to monitor')
+    
+    # Daemon command
+    subparsers.add_parser('daemon', help='Serve status, IP and rotation requests over a UNIX socket')
     
     args = parser.parse_args()
     
@@ -644,15 +1287,29 @@ def main():
         parser.print_help()
         return
     
-    # Initialize VPS Manager
-    vps_manager = VPSManager(config_path=args.config)
+    if args.command == 'daemon':
+        if not run_daemon(VPSManager(config_path=args.config), args.socket):
+            sys.exit(1)
+        return
+    
+    request = {'cmd': args.command}
+    request.update((key, value) for key, value in vars(args).items() if key not in ('command', 'config', 'socket'))
+    
+    # Prefer a running daemon; otherwise initialize VPS Manager in-process.
+    # An explicit --config always runs in-process, since the daemon has its own config.
+    use_daemon = args.command in DAEMON_COMMANDS and not args.config
+    reply = query_daemon(request, args.socket) if use_daemon else None
+    if reply is None:
+        result = execute_command(VPSManager(config_path=args.config), request)
+    elif reply.get('ok'):
+        result = reply['result']
+    else:
+        print(f"Daemon error: {reply.get('error')}")
+        sys.exit(1)
     
     # Execute commands
     if args.command == 'status':
-        status = vps_manager.get_vps_status()
-        
-        if args.save:
-            vps_manager.save_status_to_file(status)
+        status = result
         
         if args.json:
             print(json.dumps(status, indent=2))
@@ -683,18 +1340,10 @@ def main():
                 print(f"  Usage: {disk_info.get('percent', 0)}% ({disk_info.get('used_gb', 0):.1f}/{disk_info.get('total_gb', 0):.1f} GB)")
     
     elif args.command == 'ips':
-        ips = vps_manager.get_available_ips()
+        ips = result
         
         if args.public_only:
-            public_ips = []
-            for ip in ips:
-                try:
-                    ip_obj = ipaddress.ip_address(ip)
-                    if not ip_obj.is_private:
-                        public_ips.append(ip)
-                except ValueError:
-                    continue
-            ips = public_ips
+            ips = [ip for ip in ips if not _is_private_ipv4(ip)]
         
         print("Available IP addresses:")
         for ip in ips:
@@ -702,7 +1351,7 @@ def main():
         print(f"\nTotal: {len(ips)} IPs")
     
     elif args.command == 'interfaces':
-        interfaces = vps_manager.get_network_interfaces()
+        interfaces = result
         
         print("Network Interfaces:")
         for name, info in interfaces.items():
@@ -714,15 +1363,16 @@ def main():
                 print(f"    {addr['ip']}/{addr['netmask']} ({addr['family']})")
     
     elif args.command == 'add-ip':
-        success = vps_manager.add_ip_alias(args.ip, args.interface, args.netmask)
+        success = result
+        ip_list = ', '.join(args.ip)
         if success:
-            print(f"Successfully added IP {args.ip}")
+            print(f"Successfully added IP {ip_list}")
         else:
-            print(f"Failed to add IP {args.ip}")
+            print(f"Failed to add IP {ip_list}")
             sys.exit(1)
     
     elif args.command == 'remove-ip':
-        success = vps_manager.remove_ip_alias(args.ip, args.interface)
+        success = result
         if success:
             print(f"Successfully removed IP {args.ip}")
         else:
@@ -730,7 +1380,7 @@ def main():
             sys.exit(1)
     
     elif args.command == 'rotate-ip':
-        selected_ip = vps_manager.rotate_ip_for_sending(exclude_ips=args.exclude)
+        selected_ip = result
         if selected_ip:
             print(f"Selected IP for sending: {selected_ip}")
         else:
@@ -738,13 +1388,13 @@ def main():
             sys.exit(1)
     
     elif args.command == 'monitor':
-        health = vps_manager.monitor_ip_health(args.ip)
-        print(f"Health status for {args.ip}:")
-        print(f"  Reachable: {'✓' if health['reachable'] else '✗'}")
-        if health['response_time_ms']:
-            print(f"  Response Time: {health['response_time_ms']:.2f}ms")
-        if health['reverse_dns']:
-            print(f"  Reverse DNS: {health['reverse_dns']}")
+        for ip, health in result.items():
+            print(f"Health status for {ip}:")
+            print(f"  Reachable: {'✓' if health['reachable'] else '✗'}")
+            if health['response_time_ms']:
+                print(f"  Response Time: {health['response_time_ms']:.2f}ms")
+            if health['reverse_dns']:
+                print(f"  Reverse DNS: {health['reverse_dns']}")
 
 
 if __name__ == '__main__':